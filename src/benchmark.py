@@ -0,0 +1,253 @@
+"""Benchmark every scene in src/ and compare against a stored baseline.
+
+Each scene is rendered on its own, one at a time, at low quality (854x480,
+15fps) into a fresh media folder with manim's caching off, so LaTeX, Pango and
+every animation run cold. For each scene it records wall and CPU time, frames
+written, frames per second, peak RSS, and the time spent compiling LaTeX,
+laying out text with Pango and parsing SVGs (the last one includes the SVGs
+that LaTeX and Pango produce).
+
+    uv run python src/benchmark.py run                        writes media/benchmarks/latest.json
+    uv run python src/benchmark.py run --only bandwidth --repeat 3
+    uv run python src/benchmark.py run -o benchmarks/baseline.json
+    uv run python src/benchmark.py compare                    latest vs benchmarks/baseline.json
+
+As a render hook (RENDER_HOOKS=benchmark) it collects the in-process numbers
+and writes them to RENDER_BENCHMARK when the scene finishes.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from render_cache import toolchain_versions
+
+repo_root = Path(__file__).resolve().parent.parent
+src_folder = repo_root / "src"
+results_path = repo_root / "media" / "benchmarks" / "latest.json"
+baseline_path = repo_root / "benchmarks" / "baseline.json"
+
+QUALITY = "-ql"
+# metric: (label, smallest change worth flagging), lower is better for all of them
+METRICS = {
+    "wall_seconds": ("wall", 0.5),
+    "cpu_seconds": ("cpu", 0.5),
+    "peak_rss_mb": ("peak rss", 50),
+    "tex_seconds": ("latex", 0.25),
+    "pango_seconds": ("pango", 0.25),
+    "svg_seconds": ("svg", 0.25),
+}
+
+
+def find_scenes(only=None):
+    """(module, scene) for every class in src/ that subclasses one of manim's scenes and has a construct.
+
+    Base classes without one have nothing to render.
+    """
+    scenes = []
+    for path in sorted(src_folder.glob("*.py")):
+        tree = ast.parse(path.read_text())
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = [base.id if isinstance(base, ast.Name) else getattr(base, "attr", "") for base in node.bases]
+            if not any(base.endswith("Scene") for base in bases):
+                continue
+            if not any(isinstance(item, ast.FunctionDef) and item.name == "construct" for item in node.body):
+                continue
+            if only and path.stem not in only and node.name not in only:
+                continue
+            scenes.append((path.stem, node.name))
+    return scenes
+
+
+def render_scene(module, scene, hooks=()):
+    """Render one scene in a fresh media folder and return its measurements."""
+    media_dir = Path(tempfile.mkdtemp(prefix="benchmark-"))
+    probe_path = media_dir / "probe.json"
+    command = [
+        sys.executable, str(src_folder / "run_manim.py"), "render", QUALITY,
+        "--disable_caching",
+        "--format", "mp4",
+        "--progress_bar", "none",
+        "--media_dir", str(media_dir),
+        str(src_folder / f"{module}.py"),
+        scene,
+    ]
+    env = dict(
+        os.environ,
+        RENDERING_MODE="True",
+        RENDER_HOOKS=",".join([*hooks, "benchmark"]),
+        RENDER_BENCHMARK=str(probe_path),
+    )
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=repo_root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    stderr = process.stderr.read()
+    # wait4 gives this child's own usage, including the processes it started and waited for
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    result = {
+        "returncode": process.returncode,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 3),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+    }
+    if probe_path.exists():
+        result.update(json.loads(probe_path.read_text()))
+        result["fps"] = round(result["frames"] / wall, 2) if wall else 0.0
+    if process.returncode:
+        result["error"] = stderr.strip().splitlines()[-1] if stderr.strip() else "manim failed"
+    shutil.rmtree(media_dir, ignore_errors=True)
+    return result
+
+
+def run(scenes, repeat=1, hooks=()):
+    results = {}
+    for module, scene in scenes:
+        name = f"{module}:{scene}"
+        runs = []
+        for _ in range(repeat):
+            runs.append(render_scene(module, scene, hooks))
+            if runs[-1]["returncode"]:
+                break
+        # Median run by wall time, so a single hiccup doesn't move the numbers
+        runs.sort(key=lambda result: result["wall_seconds"])
+        result = runs[len(runs) // 2]
+        result["repeat"] = len(runs)
+        results[name] = result
+        print_result(name, result)
+    return results
+
+
+def print_result(name, result):
+    if result["returncode"]:
+        print(f"FAIL  {name}: {result.get('error')}")
+        return
+    print(
+        f"ok    {name}: {result['wall_seconds']:.1f}s wall, {result['cpu_seconds']:.1f}s cpu, "
+        f"{result.get('frames', 0)} frames at {result.get('fps', 0):.1f} fps, {result['peak_rss_mb']:.0f} MB, "
+        f"latex {result.get('tex_seconds', 0):.2f}s, pango {result.get('pango_seconds', 0):.2f}s, svg {result.get('svg_seconds', 0):.2f}s"
+    )
+
+
+def compare(baseline, current, threshold):
+    """Print every metric that got more than ``threshold`` worse, returning the number of regressions."""
+    regressions = 0
+    for name, before in sorted(baseline["scenes"].items()):
+        after = current["scenes"].get(name)
+        if after is None:
+            continue
+        if after["returncode"] and not before["returncode"]:
+            print(f"FAIL  {name}: now fails ({after.get('error')})")
+            regressions += 1
+            continue
+        for metric, (label, noise) in METRICS.items():
+            old, new = before.get(metric), after.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > threshold and new - old > noise:
+                print(f"SLOW  {name}: {label} {old:g} -> {new:g} (+{change:.0%})")
+                regressions += 1
+            elif change < -threshold and old - new > noise:
+                print(f"fast  {name}: {label} {old:g} -> {new:g} ({change:.0%})")
+    new_scenes = sorted(set(current["scenes"]) - set(baseline["scenes"]))
+    if new_scenes:
+        print(f"not in baseline: {', '.join(new_scenes)}")
+    if baseline.get("toolchain") != current.get("toolchain"):
+        print(f"toolchain changed: {baseline.get('toolchain')} -> {current.get('toolchain')}")
+    return regressions
+
+
+def install():
+    """Hook side: time LaTeX, Pango and SVG parsing, count frames, dump them when the scene finishes."""
+    from manim import MarkupText, SVGMobject, Text
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.utils import tex_file_writing
+
+    from hooks import patch
+
+    probe_path = os.environ["RENDER_BENCHMARK"]
+    totals = {"tex_seconds": 0.0, "pango_seconds": 0.0, "svg_seconds": 0.0, "frames": 0}
+
+    def timed(owner, name, metric):
+        @patch(owner, name)
+        def wrapper(original, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                totals[metric] += time.perf_counter() - start
+
+    # Only called when the Tex cache misses, which is always in a fresh media folder
+    timed(tex_file_writing, "compile_tex", "tex_seconds")
+    timed(tex_file_writing, "convert_to_svg", "tex_seconds")
+    timed(Text, "_text2svg", "pango_seconds")
+    timed(MarkupText, "_text2svg", "pango_seconds")
+    timed(SVGMobject, "generate_mobject", "svg_seconds")
+
+    @patch(CairoRenderer, "add_frame")
+    def add_frame(original, self, frame, num_frames=1):
+        if not self.skip_animations:
+            totals["frames"] += num_frames
+        original(self, frame, num_frames)
+
+    @patch(CairoRenderer, "scene_finished")
+    def scene_finished(original, self, scene):
+        original(self, scene)
+        probe = {metric: round(value, 3) for metric, value in totals.items()}
+        probe["plays"] = self.num_plays
+        with open(probe_path, "w") as probe_file:
+            json.dump(probe, probe_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="benchmark the scenes")
+    run_parser.add_argument("--only", nargs="+", help="only these modules or scene names")
+    run_parser.add_argument("--repeat", type=int, default=1, help="render each scene this many times and keep the median")
+    run_parser.add_argument("--hooks", default="", help="render hooks to benchmark with, e.g. frame_pool,hold_frames")
+    run_parser.add_argument("-o", "--output", type=Path, default=results_path)
+    compare_parser = subparsers.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("current", type=Path, nargs="?", default=results_path)
+    compare_parser.add_argument("--baseline", type=Path, default=baseline_path)
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="relative slowdown to flag (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        scenes = find_scenes(args.only)
+        hooks = [name for name in args.hooks.split(",") if name]
+        results = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine": f"{platform.node()} {platform.machine()} {os.cpu_count()} cpus",
+            "python": platform.python_version(),
+            "toolchain": toolchain_versions(),
+            "quality": QUALITY,
+            "hooks": hooks,
+            "scenes": run(scenes, args.repeat, hooks),
+        }
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"results written to {args.output}")
+        return 1 if any(result["returncode"] for result in results["scenes"].values()) else 0
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    regressions = compare(baseline, current, args.threshold)
+    print(f"{regressions} regression{'s' if regressions != 1 else ''} against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Skip drawing mobjects that are entirely outside the camera's frame.
+
+manim's camera draws every mobject in the scene in every frame, wherever it
+is. FilterAnimation zooms its camera to a tenth of the frame, and the particles,
+waves, interference circles and most of the perception SVG are still drawn
+around it. This hook filters what Camera.get_mobjects_to_display returns (the
+list capture_mobjects draws) down to the mobjects whose bounding box, padded by
+their stroke, overlaps the frame. Every 2D camera goes through it: the scene's,
+a ZoomedScene's zoomed camera, and the ones static_layers.py, sprite_cache.py
+and frame_pool.py draw with.
+
+Bounding boxes are cached for the length of a play, for the mobjects that can't
+change during it: not part of an animation and without updaters, nor anything
+they belong to. Everything else, and everything between plays when the scene's
+own code can change anything, is measured again each time.
+"""
+from manim import logger
+from manim.camera.camera import Camera
+from manim.camera.three_d_camera import ThreeDCamera
+from manim.mobject.types.image_mobject import AbstractImageMobject
+from manim.mobject.types.point_cloud_mobject import PMobject
+from manim.mobject.types.vectorized_mobject import VMobject
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene import Scene
+from manim.utils.iterables import list_update
+
+from hooks import patch
+from particles import ParticleCloud
+
+# cairo's default miter limit lets a sharp corner reach 5 stroke widths past its point
+MITER_REACH = 5
+
+
+def bounds(camera, mobject):
+    """(left, bottom, right, top, pad in frame units, pad in pixels) of what drawing ``mobject`` can touch,
+    or None for mobjects that aren't safe to cull."""
+    if isinstance(mobject, VMobject):
+        width = max(mobject.get_stroke_width(), mobject.get_stroke_width(background=True))
+        # Strokes are sized in frame units, they zoom with the camera
+        frame_pad, pixel_pad = MITER_REACH * width * camera.cairo_line_width_multiple, 0
+    elif isinstance(mobject, ParticleCloud):
+        # stroke_width pixels across, or a Dot of radius across with particle_zoom
+        frame_pad, pixel_pad = mobject.radius, mobject.stroke_width
+    elif isinstance(mobject, PMobject):
+        # Points are squares stroke_width pixels across whatever the zoom
+        frame_pad, pixel_pad = 0, mobject.stroke_width
+    elif isinstance(mobject, AbstractImageMobject):
+        frame_pad, pixel_pad = 0, 0
+    else:
+        return None
+    points = mobject.points
+    if not len(points):
+        return None
+    low, high = points.min(axis=0), points.max(axis=0)
+    return (low[0], low[1], high[0], high[1], frame_pad, pixel_pad)
+
+
+class Culling:
+    def __init__(self):
+        # ids of the mobjects that can't change in the current play, None between plays
+        self.static = None
+        # id -> (mobject, bounds), for static mobjects only
+        self.bounds = {}
+        self.culled = 0
+        self.considered = 0
+
+    def start_play(self, scene):
+        self.bounds.clear()
+        self.static = None
+        if scene.updaters:
+            return
+        animated = {id(member) for animation in scene.animations or [] for member in animation.mobject.get_family()}
+        static = set()
+        for mobject in list_update(scene.mobjects, scene.foreground_mobjects):
+            family = mobject.get_family()
+            if not any(id(member) in animated or member.updaters for member in family):
+                static.update(id(member) for member in family)
+        self.static = static
+
+    def end_play(self):
+        self.bounds.clear()
+        self.static = None
+
+    def get_bounds(self, camera, mobject):
+        if self.static is None or id(mobject) not in self.static:
+            return bounds(camera, mobject)
+        cached = self.bounds.get(id(mobject))
+        # The mobject too, an id can be reused by a mobject made during the play
+        if cached is None or cached[0] is not mobject:
+            cached = (mobject, bounds(camera, mobject))
+            self.bounds[id(mobject)] = cached
+        return cached[1]
+
+    def visible(self, camera, mobjects):
+        center, half_width, half_height = camera.frame_center, camera.frame_width / 2, camera.frame_height / 2
+        # One pixel more for antialiasing
+        pixel = camera.frame_width / camera.pixel_width
+        shown = []
+        for mobject in mobjects:
+            box = self.get_bounds(camera, mobject)
+            if box is not None:
+                left, bottom, right, top, frame_pad, pixel_pad = box
+                pad = frame_pad + (pixel_pad + 1) * pixel
+                if (
+                    right + pad < center[0] - half_width
+                    or left - pad > center[0] + half_width
+                    or top + pad < center[1] - half_height
+                    or bottom - pad > center[1] + half_height
+                ):
+                    self.culled += 1
+                    continue
+            shown.append(mobject)
+        self.considered += len(mobjects)
+        return shown
+
+
+def install():
+    culling = Culling()
+
+    @patch(Camera, "get_mobjects_to_display")
+    def get_mobjects_to_display(original, self, *args, **kwargs):
+        mobjects = original(self, *args, **kwargs)
+        if isinstance(self, ThreeDCamera):
+            # Projected, its frame isn't a rectangle in scene coordinates
+            return mobjects
+        return culling.visible(self, mobjects)
+
+    @patch(Scene, "begin_animations")
+    def begin_animations(original, self):
+        original(self)
+        culling.start_play(self)
+
+    @patch(CairoRenderer, "play")
+    def play(original, self, scene, *args, **kwargs):
+        try:
+            return original(self, scene, *args, **kwargs)
+        finally:
+            culling.end_play()
+
+    @patch(CairoRenderer, "scene_finished")
+    def scene_finished(original, self, scene):
+        original(self, scene)
+        if culling.culled:
+            logger.info(
+                "Culling: skipped %(culled)d of %(considered)d mobject draws as off screen",
+                {"culled": culling.culled, "considered": culling.considered},
+            )
@@ -1,4 +1,8 @@
 from manim import *
+from tex_cache import Tex
+from svg_assets import SVGMobject
+from raster_assets import ImageMobject
+from thinking import ThinkingAnimation
 import numpy as np
 
 import os
@@ -8,64 +12,11 @@ asset_folder = "../video_assets" # Path to assets folder for preview
 if os.environ.get("RENDERING_MODE"):
     asset_folder = "./video_assets"
 
-class ThinkingAnimation(Animation):
-    def __init__(
-        self,
-        position=ORIGIN,  # Added position parameter
-        radius=3,
-        num_dots=8,
-        color=BLACK,
-        rate_func=linear,
-        run_time=2,
-        **kwargs
-    ):
-        # Create a VGroup to hold all the dots
-        self.circle_group = VGroup()
-        self.num_dots = num_dots
-        self.radius = radius
-
-        # Create dots arranged in a circle
-        for i in range(num_dots):
-            angle = i * TAU / num_dots
-            dot = Dot(
-                point=radius * RIGHT,
-                color=color,
-                radius=0.15
-            ).rotate(angle, about_point=ORIGIN)
-            self.circle_group.add(dot)
-
-        # Move the entire group to the specified position
-        self.circle_group.move_to(position)
-
-        super().__init__(
-            self.circle_group,
-            rate_func=rate_func,
-            run_time=run_time,
-            **kwargs
-        )
-
-    def interpolate_mobject(self, alpha):
-        for i, dot in enumerate(self.circle_group):
-            phase = alpha * TAU + (i * TAU / self.num_dots)
-            opacity = (np.sin(phase) + 1) / 2
-            dot.set_opacity(opacity)
-
-class CurlyBraceTransformation(ZoomedScene):
-    CONFIG = { # Added CONFIG for ZoomedScene
-        "zoom_factor": 0.3,
-        "zoomed_display_height": 2, # Adjusted height and width
-        "zoomed_display_width": 7,
-        "image_frame_stroke_width": 3, # Reduced stroke width
-        "zoomed_camera_config": {
-            "default_frame_stroke_width": 1, # Reduced stroke width in zoomed camera
-        },
-    }
+class CurlyBraceTransformation(MovingCameraScene):
 
     def construct(self):
         # Set the background color to white
         self.camera.background_color = WHITE
-        frame =  self.zoomed_camera.frame
-        frame.scale(.8)
         rect_color = ManimColor((241, 172, 75))
         think_color = ManimColor((255, 182, 55))
         # First set of braces (top)
@@ -128,7 +79,7 @@ class CurlyBraceTransformation(ZoomedScene):
                           color=BLACK).next_to(search1, RIGHT, buff=0.5)
         neural2 = SVGMobject(f"{asset_folder}/neural2.svg").scale(0.5)
         neural2.move_to([3.1, 3, 0])
-        mcp = ImageMobject(f"{asset_folder}/mcp.png").scale(0.25)
+        mcp = ImageMobject(f"{asset_folder}/mcp.png", scale=0.25)
         mcp.move_to([8.1, 4.5, 0])
         docs = SVGMobject(f"{asset_folder}/docs.svg").scale(0.3)
         docs.move_to([7.1, 3.5, 0])
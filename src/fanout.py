@@ -0,0 +1,137 @@
+"""Render once, encode many.
+
+The scene is rasterized once at the resolution manim was started with. Every
+frame is also downscaled and written to the extra outputs listed in
+RENDER_FANOUT, each of which keeps its own partial movie files next to
+manim's and is combined into its own mp4/gif at the end:
+
+    RENDER_FANOUT="CommunicationModel_gif:320x200:gif"
+"""
+import os
+
+import av
+import numpy as np
+from manim import config, logger, tempconfig
+from manim.scene.scene_file_writer import SceneFileWriter, to_av_frame_rate
+from PIL import Image
+
+from hooks import patch
+
+
+class FanoutOutput:
+    def __init__(self, output_name, width, height, format):
+        self.output_name = output_name
+        self.width = width
+        self.height = height
+        self.format = format
+        self.partial_movie_files = []
+        self.container = None
+        self.stream = None
+
+    @classmethod
+    def parse(cls, spec):
+        """``name:WIDTHxHEIGHT:format`` -> FanoutOutput"""
+        output_name, size, format = spec.split(":")
+        width, height = (int(value) for value in size.split("x"))
+        return cls(output_name, width, height, format)
+
+    def init_directories(self, file_writer):
+        # media/videos/<module>/<height>p<fps>/, alongside manim's own quality folder
+        primary_folder = file_writer.movie_file_path.parent
+        quality = f"{self.height}p{primary_folder.name.split('p', 1)[1]}"
+        self.movie_dir = primary_folder.parent / quality
+        self.partial_movie_directory = self.movie_dir / "partial_movie_files" / file_writer.partial_movie_directory.name
+        self.partial_movie_directory.mkdir(parents=True, exist_ok=True)
+        self.movie_file_path = self.movie_dir / f"{self.output_name}.{self.format}"
+
+    def add_partial_movie_file(self, hash_animation):
+        if hash_animation is None:
+            self.partial_movie_files.append(None)
+        else:
+            self.partial_movie_files.append(
+                str(self.partial_movie_directory / f"{hash_animation}{config['movie_file_extension']}")
+            )
+
+    def open(self, file_path):
+        self.container = av.open(file_path, mode="w")
+        self.stream = self.container.add_stream("libx264", rate=to_av_frame_rate(config.frame_rate), options={"an": "1", "crf": "23"})
+        self.stream.pix_fmt = "yuv420p"
+        self.stream.width = self.width
+        self.stream.height = self.height
+
+    def resize(self, frame):
+        # Box filter averages every source pixel, which is what we want when shrinking 720p to 200p
+        return np.asarray(Image.fromarray(frame).resize((self.width, self.height), Image.Resampling.BOX))
+
+    def encode(self, frame, num_frames):
+        resized = self.resize(frame)
+        for _ in range(num_frames):
+            av_frame = av.VideoFrame.from_ndarray(resized, format="rgba")
+            for packet in self.stream.encode(av_frame):
+                self.container.mux(packet)
+
+    def close(self):
+        for packet in self.stream.encode():
+            self.container.mux(packet)
+        self.container.close()
+        self.container = None
+        self.stream = None
+
+
+def install():
+    outputs_spec = os.environ.get("RENDER_FANOUT", "")
+
+    @patch(SceneFileWriter, "init_output_directories")
+    def init_output_directories(original, self, scene_name):
+        original(self, scene_name)
+        self.fanout_outputs = [FanoutOutput.parse(spec) for spec in outputs_spec.split(";") if spec]
+        if hasattr(self, "partial_movie_directory"):
+            for output in self.fanout_outputs:
+                output.init_directories(self)
+
+    @patch(SceneFileWriter, "add_partial_movie_file")
+    def add_partial_movie_file(original, self, hash_animation):
+        original(self, hash_animation)
+        if hasattr(self, "partial_movie_directory"):
+            for output in self.fanout_outputs:
+                output.add_partial_movie_file(hash_animation)
+
+    @patch(SceneFileWriter, "is_already_cached")
+    def is_already_cached(original, self, hash_invocation):
+        # Only skip an animation if every output already has it
+        if not original(self, hash_invocation):
+            return False
+        return all(
+            (output.partial_movie_directory / f"{hash_invocation}{config['movie_file_extension']}").exists()
+            for output in self.fanout_outputs
+        )
+
+    @patch(SceneFileWriter, "open_partial_movie_stream")
+    def open_partial_movie_stream(original, self, file_path=None):
+        for output in self.fanout_outputs:
+            output.open(output.partial_movie_files[self.renderer.num_plays])
+        original(self, file_path)
+
+    @patch(SceneFileWriter, "encode_and_write_frame")
+    def encode_and_write_frame(original, self, frame, num_frames):
+        original(self, frame, num_frames)
+        for output in self.fanout_outputs:
+            output.encode(frame, num_frames)
+
+    @patch(SceneFileWriter, "close_partial_movie_stream")
+    def close_partial_movie_stream(original, self):
+        original(self)
+        for output in self.fanout_outputs:
+            output.close()
+
+    @patch(SceneFileWriter, "combine_to_movie")
+    def combine_to_movie(original, self):
+        original(self)
+        for output in self.fanout_outputs:
+            partial_movie_files = [path for path in output.partial_movie_files if path is not None]
+            if not partial_movie_files:
+                continue
+            # combine_files reads the gif size from config
+            with tempconfig({"pixel_width": output.width, "pixel_height": output.height}):
+                self.combine_files(partial_movie_files, output.movie_file_path, create_gif=output.format == "gif")
+            logger.info("Fanout file ready at %(path)s", {"path": str(output.movie_file_path)})
@@ -1,6 +1,8 @@
 from manim import *
+from svg_assets import SVGMobject
+from particles import MoveParticles, ParticleField, repulsion
+from seeding import random_stream
 import numpy as np
-import random
 import os
 
 asset_folder = "../video_assets" # Path to assets folder for preview
@@ -8,16 +10,13 @@ asset_folder = "../video_assets" # Path to assets folder for preview
 if os.environ.get("RENDERING_MODE"):
     asset_folder = "./video_assets"
 
-class FilterAnimation(ZoomedScene): # Changed from Scene to ZoomedScene
-    CONFIG = { # Added CONFIG for ZoomedScene
-        "zoom_factor": 0.3,
-        "zoomed_display_height": 2, # Adjusted height and width
-        "zoomed_display_width": 7,
-        "image_frame_stroke_width": 3, # Reduced stroke width
-        "zoomed_camera_config": {
-            "default_frame_stroke_width": 1, # Reduced stroke width in zoomed camera
-        },
-    }
+class FilterAnimation(MovingCameraScene): # Zooms by moving its own camera frame
+    # Background particles, all drawn and moved as one point cloud
+    num_particles = 30
+    # Background particles closer than this push each other apart at up to particle_repulsion units a second, 0 turns it off
+    particle_repulsion = 0
+    particle_repulsion_distance = 0.5
+
     def construct(self):
         # Set the background color
         self.camera.background_color = WHITE
@@ -28,25 +27,26 @@ class FilterAnimation(ZoomedScene): # Changed from Scene to ZoomedScene
         rect.move_to([0, -.2, 0])
         thinking_text = MarkupText("Sensory input\nat 1Gbit / second", font="Helvetica", color=BLACK, font_size=28).next_to(input_svg, DOWN, buff=0.5)
 
-        background_group = VGroup()
+        particle_rng = random_stream(self, "particles")
+        interference_rng = random_stream(self, "interference")
+
+        background_group = Group()
         background_group.set_z_index(-1)  # Set behind everything else
 
-        # Create flowing particles
-        particles = VGroup()
-        for i in range(30):
-            particle = Dot(
-                radius=0.05,
-                color=BLUE_D,
-                fill_opacity=random.uniform(0.4, 0.8)
-            )
-            particle.move_to(
-                np.array([
-                    random.uniform(-7, 7),
-                    random.uniform(-4, 4),
-                    0
-                ])
-            )
-            particles.add(particle)
+        # Create flowing particles, each drifting from a random start to a random target.
+        # The background play() runs everything linearly over its 4 seconds, so that's their timing curve.
+        starts = np.zeros((self.num_particles, 3))
+        targets = np.zeros((self.num_particles, 3))
+        starts[:, 0], starts[:, 1] = particle_rng.uniform(-7, 7, self.num_particles), particle_rng.uniform(-4, 4, self.num_particles)
+        targets[:, 0], targets[:, 1] = particle_rng.uniform(-7, 7, self.num_particles), particle_rng.uniform(-4, 4, self.num_particles)
+        particles = ParticleField(
+            starts,
+            targets,
+            opacities=particle_rng.uniform(0.4, 0.8, self.num_particles),
+            color=BLUE_D,
+            background=self.camera.background_color,
+            run_times=4,
+        )
 
         # Add particles to background
         background_group.add(particles)
@@ -89,44 +89,29 @@ class FilterAnimation(ZoomedScene): # Changed from Scene to ZoomedScene
         self.add(rect, thinking_text, input_svg, conscious_thought_rate_text)
 
         # Background Animations (particles and interference)
-        particle_anims = []
-        for particle in particles:
-            target = particle.copy()
-            target.move_to(
-                np.array([
-                    random.uniform(-7, 7),
-                    random.uniform(-4, 4),
-                    0
-                ])
-            )
-            anim = Transform(
-                particle,
-                target,
-                run_time=random.uniform(1, 3),
-                rate_func=rate_functions.there_and_back # Changed rate_func for particles
-            )
-            particle_anims.append(anim)
-
         interference_anims = []
         for circle in interference_circles:
             anim = GrowFromCenter(
                 circle,
-                run_time=random.uniform(1, 2),
+                run_time=interference_rng.uniform(1, 2),
                 rate_func=rate_functions.there_and_back # Changed rate_func for interference
             )
             interference_anims.append(anim)
 
+        if self.particle_repulsion:
+            particles.add_updater(self.separate_particles)
+
         self.play(
-            *particle_anims,
+            MoveParticles(particles),
             *interference_anims,
             rate_func=lambda t: t,
             run_time=4 # Adjust run_time as needed for background animation
         )
+        particles.clear_updaters()
 
         # --- Zoom and Conscious Thought Animation ---
 
         zoom_duration = 3  # Duration of zoom and conscious thought animation
-        zoom_factor = 10 # Adjust zoom factor as needed
 
         # Create dots for conscious thought
         conscious_dots = VGroup()
@@ -144,10 +129,6 @@ class FilterAnimation(ZoomedScene): # Changed from Scene to ZoomedScene
 
         # Text for conscious thought rate
         
-        frame = self.zoomed_camera.frame
-        frame.move_to([-.2,.3,0])
-        frame.scale(zoom_factor)
-
         self.play(
             self.camera.frame.animate.move_to([-.2,.26,0]).scale(0.1),
             #FadeIn(conscious_thought_rate_text),
@@ -173,3 +154,7 @@ class FilterAnimation(ZoomedScene): # Changed from Scene to ZoomedScene
             self.camera.frame.animate.move_to([0,0,0]).scale(10),  # scale(10) because 1/0.1 = 10
             run_time=2
         )
+
+    def separate_particles(self, particles, dt):
+        """Push particles that drifted close together apart, all pairs at once"""
+        particles.push(repulsion(particles.points, self.particle_repulsion_distance, self.particle_repulsion) * dt)
@@ -0,0 +1,171 @@
+"""Rasterize the frames of each play() on a pool of worker processes.
+
+The scene process still runs every updater and interpolation, since those need
+the live scene, but instead of drawing each frame it snapshots the mobjects that
+are about to be drawn and hands them to a worker. Workers draw onto the play's
+static background and return the pixels. Frames are written in order, so the
+partial movie files come out the same as a serial render.
+
+Snapshots are the leaf mobjects (what camera.capture_mobjects ends up drawing)
+copied without their submobjects and updaters, so only points, colors and
+stroke settings get pickled. Anything that can't be pickled, and cameras the
+workers can't reproduce (3D, an active ZoomedScene zoom), falls back to
+rasterizing in the scene process.
+
+    RENDER_FRAME_WORKERS=8      number of rasterizer processes (default: cpu count)
+"""
+import collections
+import copy
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from manim import logger
+from manim.camera.camera import Camera
+from manim.camera.moving_camera import MovingCamera
+from manim.camera.multi_camera import MultiCamera
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene import Scene
+from manim.utils.iterables import list_update
+
+from hooks import patch
+
+# Attributes the camera doesn't need to draw a leaf mobject
+DETACHED_ATTRIBUTES = ("submobjects", "updaters", "target", "saved_state")
+
+
+class FrameCamera(Camera):
+    """The worker side camera; the frame is set for every frame, so never reuse a cairo context."""
+
+    def get_cached_cairo_context(self, pixel_array):
+        return None
+
+    def cache_cairo_context(self, pixel_array, ctx):
+        pass
+
+
+# Worker state, one camera and the current play's background per process
+worker_camera = None
+worker_background = (None, None)
+
+
+def rasterize(background_path, frame, payload):
+    global worker_camera, worker_background
+    if worker_camera is None:
+        worker_camera = FrameCamera()
+    if worker_background[0] != background_path:
+        worker_background = (background_path, np.load(background_path))
+    worker_camera.frame_center, worker_camera.frame_width, worker_camera.frame_height = frame
+    worker_camera.set_frame_to_background(worker_background[1])
+    worker_camera.capture_mobjects(pickle.loads(payload), include_submobjects=False)
+    return worker_camera.pixel_array
+
+
+def detach(mobject):
+    clone = copy.copy(mobject)
+    for name in DETACHED_ATTRIBUTES:
+        if name in clone.__dict__:
+            setattr(clone, name, [] if name in ("submobjects", "updaters") else None)
+    return clone
+
+
+def supported(camera):
+    if type(camera) not in (Camera, MovingCamera, MultiCamera):
+        return False
+    return not getattr(camera, "image_mobjects_from_cameras", None)
+
+
+class FramePool:
+    def __init__(self, workers):
+        self.workers = workers
+        # Forked once the scene exists, so workers inherit the config and the scene module
+        self.executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+        # The first submit forks every worker. Do it now, before manim starts its writer thread:
+        # forking a process with threads running can deadlock on a lock another thread held
+        self.executor.submit(int).result()
+        self.folder = Path(tempfile.mkdtemp(prefix="frame-pool-"))
+        self.pending = collections.deque()
+        self.background_path = None
+        self.serial = False
+
+    def background(self, renderer):
+        """Save the background every frame of this play starts from, once per play."""
+        if self.background_path is None:
+            background = renderer.static_image if renderer.static_image is not None else renderer.camera.background
+            self.background_path = self.folder / f"background-{renderer.num_plays}.npy"
+            np.save(self.background_path, background)
+        return str(self.background_path)
+
+    def submit(self, renderer, scene, moving_mobjects):
+        """Queue a frame for the workers, returning False if it has to be drawn here instead."""
+        if self.serial or not supported(renderer.camera):
+            return False
+        camera = renderer.camera
+        # Same fallback as CairoRenderer.update_frame
+        mobjects = moving_mobjects or list_update(scene.mobjects, scene.foreground_mobjects)
+        leaves = camera.get_mobjects_to_display(mobjects)
+        try:
+            payload = pickle.dumps([detach(leaf) for leaf in leaves], protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as error:
+            logger.info("Rasterizing the rest of this play serially, mobjects can't be pickled: %(error)s", {"error": error})
+            self.flush(renderer)
+            self.serial = True
+            return False
+        frame = (np.array(camera.frame_center), camera.frame_width, camera.frame_height)
+        self.pending.append(self.executor.submit(rasterize, self.background(renderer), frame, payload))
+        # Keep a couple of frames per worker in flight and write the rest as they come back
+        while len(self.pending) > 2 * self.workers:
+            renderer.add_frame(self.pending.popleft().result())
+        return True
+
+    def flush(self, renderer):
+        while self.pending:
+            renderer.add_frame(self.pending.popleft().result())
+
+    def end_play(self, renderer):
+        self.flush(renderer)
+        if self.background_path is not None:
+            self.background_path.unlink(missing_ok=True)
+            self.background_path = None
+        self.serial = False
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+def install():
+    workers = int(os.environ.get("RENDER_FRAME_WORKERS") or os.cpu_count())
+    pools = {}
+
+    @patch(CairoRenderer, "init_scene")
+    def init_scene(original, self, scene):
+        original(self, scene)
+        pools[self] = FramePool(workers)
+
+    @patch(CairoRenderer, "render")
+    def render(original, self, scene, time, moving_mobjects):
+        pool = pools.get(self)
+        if pool is None or not pool.submit(self, scene, moving_mobjects):
+            original(self, scene, time, moving_mobjects)
+
+    @patch(Scene, "play_internal")
+    def play_internal(original, self, skip_rendering=False):
+        pool = pools.get(self.renderer)
+        try:
+            original(self, skip_rendering)
+        finally:
+            if pool is not None:
+                pool.end_play(self.renderer)
+
+    @patch(CairoRenderer, "scene_finished")
+    def scene_finished(original, self, scene):
+        pool = pools.pop(self, None)
+        if pool is not None:
+            pool.close()
+        original(self, scene)
@@ -0,0 +1,158 @@
+"""Turn rendered movies into small gifs for the README.
+
+manim's --format=gif runs every frame through palettegen/paletteuse and writes
+each one, 60 times a second. This writes the same movie with:
+
+- one palette for the whole scene, built from a sample of its frames
+- no dithering, so pixels that don't change keep their palette index and the
+  gif encoder can store only the changed rectangle, with the unchanged pixels
+  in it transparent
+- identical consecutive frames merged into one frame with a longer delay
+- only the rectangle that changed since the previous frame quantized, the
+  rest of the frame keeps the previous frame's palette indices
+- optionally a lower frame rate (RENDER_GIF_FPS=20), 60fps is wasted at 320x200
+
+Frames keep their timestamps, so a held frame (see hold_frames.py) stays on
+screen for as long as it does in the mp4.
+
+As a hook it replaces manim's gif path, including the gifs fanout.py writes.
+"""
+import os
+from pathlib import Path
+
+import av
+import numpy as np
+from PIL import Image
+
+# gif frame delays are in hundredths of a second
+GIF_RATE = 100
+PALETTE_SAMPLES = 32
+# Palette index left empty for the encoder to use as transparency
+TRANSPARENT_INDEX = 255
+
+
+def default_fps():
+    fps = os.environ.get("RENDER_GIF_FPS")
+    return float(fps) if fps else None
+
+
+def open_movies(movies, list_path):
+    """Open one movie, or several back to back through the concat demuxer like manim's combine_files."""
+    if len(movies) == 1:
+        return av.open(str(movies[0]))
+    list_path.write_text("".join(f"file 'file:{Path(movie).as_posix()}'\n" for movie in movies))
+    return av.open(str(list_path), options={"safe": "0"}, format="concat")
+
+
+def read_frames(movie, fps=None):
+    """(time, rgb array) for every frame that changes the picture, and the time the movie ends.
+
+    With ``fps``, only the frame on screen at each 1/fps tick is kept.
+    """
+    stream = movie.streams.video[0]
+    frames = []
+
+    def keep(time, image):
+        if not frames or not np.array_equal(image, frames[-1][1]):
+            frames.append((time, image))
+
+    tick = 0.0
+    candidate = None
+    time = 0.0
+    for frame in movie.decode(stream):
+        time = frame.time
+        image = frame.to_ndarray(format="rgb24")
+        if not fps:
+            keep(time, image)
+            continue
+        # Held frames leave gaps between timestamps, fill every tick up to this frame with the previous one
+        while candidate is not None and tick < time - 1e-6:
+            keep(tick, candidate)
+            tick += 1 / fps
+        candidate = image
+    if candidate is not None:
+        keep(tick, candidate)
+    return frames, time + 1 / float(stream.guessed_rate or 60)
+
+
+def build_palette(images):
+    """Quantize an evenly spaced sample of the frames, stacked into one image, to 255 colors."""
+    step = max(1, len(images) // PALETTE_SAMPLES)
+    sample = Image.fromarray(np.concatenate(images[::step][:PALETTE_SAMPLES]))
+    return sample.quantize(colors=TRANSPARENT_INDEX, method=Image.Quantize.MEDIANCUT)
+
+
+def argb_palette(palette_image):
+    rgb = np.zeros((256, 3), np.uint8)
+    colors = np.frombuffer(bytes(palette_image.getpalette()[: 3 * TRANSPARENT_INDEX]), np.uint8)
+    rgb[: len(colors) // 3] = colors.reshape(-1, 3)
+    alpha = np.full((256, 1), 255, np.uint8)
+    alpha[TRANSPARENT_INDEX] = 0
+    return np.hstack([alpha, rgb])
+
+
+def quantize(palette_image, image, previous=None, previous_indices=None):
+    """Palette indices of ``image``, only quantizing the rectangle where it differs from ``previous``.
+
+    Without dithering each pixel maps to its nearest palette color on its own, so
+    quantizing a crop gives the same indices as quantizing the whole frame.
+    """
+    if previous is None:
+        return np.asarray(Image.fromarray(image).quantize(palette=palette_image, dither=Image.Dither.NONE))
+    changed = (image != previous).any(axis=2)
+    rows, columns = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+    indices = previous_indices.copy()
+    if len(rows):
+        y0, y1, x0, x1 = rows[0], rows[-1] + 1, columns[0], columns[-1] + 1
+        crop = Image.fromarray(np.ascontiguousarray(image[y0:y1, x0:x1]))
+        indices[y0:y1, x0:x1] = np.asarray(crop.quantize(palette=palette_image, dither=Image.Dither.NONE))
+    return indices
+
+
+def write_gif(movies, gif_path, fps=None):
+    gif_path = Path(gif_path)
+    list_path = gif_path.with_suffix(".txt")
+    with open_movies(movies, list_path) as movie:
+        frames, end_time = read_frames(movie, fps)
+    list_path.unlink(missing_ok=True)
+
+    palette_image = build_palette([image for _, image in frames])
+    palette = argb_palette(palette_image)
+    height, width = frames[0][1].shape[:2]
+    with av.open(str(gif_path), mode="w") as output:
+        output_stream = output.add_stream("gif", rate=GIF_RATE, options={"gifflags": "+offsetting+transdiff"})
+        output_stream.pix_fmt = "pal8"
+        output_stream.width = width
+        output_stream.height = height
+
+        last_pts = -1
+        previous = indices = None
+        for time, image in frames:
+            indices = quantize(palette_image, image, previous, indices)
+            previous = image
+            av_frame = av.VideoFrame.from_ndarray((indices, palette), format="pal8")
+            av_frame.pts = max(round(time * GIF_RATE), last_pts + 1)
+            last_pts = av_frame.pts
+            output.mux(output_stream.encode(av_frame))
+        # Repeat the last frame at the end, so its delay covers the rest of the movie
+        if round(end_time * GIF_RATE) - 1 > last_pts:
+            av_frame = av.VideoFrame.from_ndarray((indices, palette), format="pal8")
+            av_frame.pts = round(end_time * GIF_RATE) - 1
+            output.mux(output_stream.encode(av_frame))
+        output.mux(output_stream.encode())
+
+
+def install():
+    # Imported here so render.py can use write_gif without loading manim
+    from manim import config
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    from hooks import patch
+
+    fps = default_fps()
+
+    @patch(SceneFileWriter, "combine_files")
+    def combine_files(original, self, input_files, output_file, create_gif=False, includes_sound=False):
+        if not create_gif or config.transparent:
+            return original(self, input_files, output_file, create_gif, includes_sound)
+        write_gif(input_files, output_file, fps)
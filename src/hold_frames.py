@@ -0,0 +1,92 @@
+"""Encode runs of identical frames once, as a variable frame rate movie.
+
+A frozen ``self.wait(10)`` at 60fps reaches the encoder as one frame repeated
+600 times, and static stretches inside animations repeat frames too. This hook
+encodes only the first and last frame of each run, with the timestamps in
+between left empty, so the mp4 still plays for the same length. The gif_export
+hook keeps those timestamps, so a held frame becomes a single gif frame with a
+long delay.
+
+The held movies are encoded without B-frames: x264 reorders timestamps around
+them, and an mp4 ending in a long hold would otherwise be cut short at the last
+decode timestamp. manim joins partial movies by stream copy, so they get their
+own play() hashes and never get mixed with ones rendered without this hook.
+
+Install it before fanout (render.py does) so it replaces manim's own encoding
+and fanout's outputs get the same treatment.
+"""
+import av
+import numpy as np
+from manim.renderer import cairo_renderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from fanout import FanoutOutput
+from hooks import patch
+
+
+class FrameHolder:
+    """Feeds frames to an encoder, holding back repeats of the previous frame."""
+
+    def __init__(self, stream, container):
+        stream.codec_context.max_b_frames = 0
+        self.stream = stream
+        self.container = container
+        self.frame = None
+        self.count = 0
+        self.next_pts = 0
+
+    def add(self, frame, num_frames):
+        if self.frame is not None and np.array_equal(frame, self.frame):
+            self.count += num_frames
+            return
+        self.flush()
+        self.frame = frame
+        self.count = num_frames
+
+    def flush(self):
+        if self.frame is None:
+            return
+        # The last frame of the run marks where it ends
+        for pts in sorted({self.next_pts, self.next_pts + self.count - 1}):
+            av_frame = av.VideoFrame.from_ndarray(self.frame, format="rgba")
+            av_frame.pts = pts
+            for packet in self.stream.encode(av_frame):
+                self.container.mux(packet)
+        self.next_pts += self.count
+        self.frame = None
+        self.count = 0
+
+
+def install():
+    @patch(cairo_renderer, "get_hash_from_play_call")
+    def get_hash_from_play_call(original, *args, **kwargs):
+        return f"{original(*args, **kwargs)}_held"
+
+    @patch(SceneFileWriter, "open_partial_movie_stream")
+    def open_partial_movie_stream(original, self, file_path=None):
+        original(self, file_path)
+        self.frame_holder = FrameHolder(self.video_stream, self.video_container)
+
+    @patch(SceneFileWriter, "encode_and_write_frame")
+    def encode_and_write_frame(original, self, frame, num_frames):
+        self.frame_holder.add(frame, num_frames)
+
+    @patch(SceneFileWriter, "listen_and_write")
+    def listen_and_write(original, self):
+        # Runs on the writer thread, which close_partial_movie_stream joins before flushing the encoder
+        original(self)
+        self.frame_holder.flush()
+
+    @patch(FanoutOutput, "open")
+    def open(original, self, file_path):
+        original(self, file_path)
+        self.frame_holder = FrameHolder(self.stream, self.container)
+
+    @patch(FanoutOutput, "encode")
+    def encode(original, self, frame, num_frames):
+        self.frame_holder.add(self.resize(frame), num_frames)
+
+    @patch(FanoutOutput, "close")
+    def close(original, self):
+        self.frame_holder.flush()
+        original(self)
@@ -0,0 +1,57 @@
+"""Opt-in patches to manim's renderer, installed by run_manim.py.
+
+Each hook is a module in src/ with an ``install()`` function. The orchestrator
+picks them with the RENDER_HOOKS environment variable, e.g. RENDER_HOOKS=fanout.
+"""
+import functools
+import importlib
+
+AVAILABLE = [
+    "benchmark",
+    "culling",
+    "fanout",
+    "frame_pool",
+    "gif_export",
+    "hold_frames",
+    "lazy_zoom",
+    "particle_zoom",
+    "play_profile",
+    "segment_cache",
+    "sprite_cache",
+    "static_layers",
+    "tex_precompile",
+    "text_cache",
+    "timeline",
+]
+
+
+def patch(cls, name):
+    """Wrap ``cls.name``; the decorated function gets the original method as its first argument.
+
+    Hooks stack: patching a method twice wraps the previous wrapper.
+    """
+    original = getattr(cls, name)
+
+    def decorator(func):
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            return func(original, *args, **kwargs)
+
+        setattr(cls, name, wrapper)
+        return func
+
+    return decorator
+
+
+def parse(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def install(value):
+    """Install every hook named in a comma separated list, in order."""
+    names = parse(value)
+    for name in names:
+        if name not in AVAILABLE:
+            raise ValueError(f"Unknown render hook {name!r}, expected one of {', '.join(AVAILABLE)}")
+        importlib.import_module(name).install()
+    return names
@@ -0,0 +1,101 @@
+"""Only make a ZoomedScene's zoomed camera once zooming is activated.
+
+manim's ZoomedScene sets up a second MovingCamera, with its own full size
+pixel array and background, and the display that shows it, for every scene
+that subclasses it, whether it ever calls activate_zooming or not. With this
+hook ZoomedScene.setup only makes the frame the zoomed camera looks through up
+front, so scenes can position it (``self.zoomed_camera.frame.scale(.8)``). The
+camera and its display are made the first time anything else of them is used,
+which is activate_zooming for most scenes, and until then there is nothing
+extra to draw.
+
+A scene that finishes without activating zooming gets a warning, MovingCameraScene
+renders it the same. So does a legacy ``CONFIG`` dict, which manim ignores.
+
+    RENDER_HOOKS=lazy_zoom python src/run_manim.py render src/scene.py SomeZoomedScene
+"""
+from manim import WHITE, ImageMobjectFromCamera, MovingCamera, MovingCameraScene, ScreenRectangle, ZoomedScene, config, logger
+
+from hooks import patch
+
+
+class LazyZoomedCamera:
+    """Stands in for the zoomed camera with just its frame, making the real one when anything else is asked for."""
+
+    def __init__(self, scene, frame):
+        self.scene = scene
+        self.frame = frame
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.scene.create_zoomed_camera(), name)
+
+
+def setup(scene):
+    # Everything ZoomedScene.setup does, minus making the camera and its display
+    MovingCameraScene.setup(scene)
+    frame = ScreenRectangle(height=config.frame_height)
+    frame.set_stroke(
+        scene.zoomed_camera_config.get("default_frame_stroke_color", WHITE),
+        scene.zoomed_camera_config.get("default_frame_stroke_width", 0),
+    )
+    frame.stretch_to_fit_height(scene.zoomed_display_height)
+    frame.stretch_to_fit_width(scene.zoomed_display_width)
+    frame.scale(scene.zoom_factor)
+    frame.move_to(scene.zoomed_camera_frame_starting_position)
+    scene.zoomed_camera = LazyZoomedCamera(scene, frame)
+    scene._zoomed_display = None
+
+
+def create_zoomed_camera(scene):
+    """The zoomed camera and its display, made on first use."""
+    if scene._zoomed_display is None:
+        camera = MovingCamera(frame=scene.zoomed_camera.frame, **scene.zoomed_camera_config)
+        display = ImageMobjectFromCamera(camera, **scene.zoomed_camera_image_mobject_config)
+        display.add_display_frame()
+        display.stretch_to_fit_height(scene.zoomed_display_height)
+        display.stretch_to_fit_width(scene.zoomed_display_width)
+        if scene.zoomed_display_center is not None:
+            display.move_to(scene.zoomed_display_center)
+        else:
+            display.to_corner(scene.zoomed_display_corner, buff=scene.zoomed_display_corner_buff)
+        scene.zoomed_camera = camera
+        scene._zoomed_display = display
+    return scene.zoomed_camera
+
+
+def get_zoomed_display(scene):
+    create_zoomed_camera(scene)
+    return scene._zoomed_display
+
+
+def set_zoomed_display(scene, display):
+    create_zoomed_camera(scene)
+    scene._zoomed_display = display
+
+
+def warn_unused(scene):
+    name = type(scene).__name__
+    if not scene.zoom_activated:
+        logger.warning(
+            "%(name)s subclasses ZoomedScene but never activates zooming, MovingCameraScene renders it the same",
+            {"name": name},
+        )
+    if any("CONFIG" in vars(cls) for cls in type(scene).__mro__):
+        logger.warning("%(name)s sets CONFIG, which manim ignores, pass those settings to __init__ instead", {"name": name})
+
+
+def install():
+    @patch(ZoomedScene, "setup")
+    def lazy_setup(original, self):
+        setup(self)
+
+    ZoomedScene.create_zoomed_camera = create_zoomed_camera
+    # setup no longer sets it, activate_zooming and the pop out animation read it from here
+    ZoomedScene.zoomed_display = property(get_zoomed_display, set_zoomed_display)
+
+    @patch(ZoomedScene, "tear_down")
+    def tear_down(original, self):
+        original(self)
+        warn_unused(self)
@@ -1,4 +1,7 @@
 from manim import *
+from svg_assets import SVGMobject
+from particles import ParticleCloud, repulsion
+from seeding import step_stream
 import numpy as np
 import os
 
@@ -12,36 +15,43 @@ asset_folder = "../video_assets" # Path to assets folder for preview
 if os.environ.get("RENDERING_MODE"):
     asset_folder = "./video_assets"
 
-class NoiseBox(VGroup):
-    def __init__(self, height=4, width=6, num_particles=150, **kwargs):
+class NoiseBox(Group):
+    def __init__(self, height=4, width=6, num_particles=150, repulsion_strength=0, repulsion_distance=0.3, scene=None, name="NoiseBox", **kwargs):
         super().__init__(**kwargs)
         
         # Store original dimensions
         self.box_width = width
         self.box_height = height
         self.scale_factor = 1.0
+        self.particle_radius = 0.05
+        # Seeded, so every render moves the particles the same way. The starting positions and
+        # each step of the walk draw from their own streams, see update_particles
+        self.scene = scene
+        self.name = name
+        # Steps of the walk taken so far, and where the play the last update was in starts, in steps
+        self.steps = 0
+        self.play = None
+        self.play_start = 0
+        self.play_frames = 0
+        self.elapsed = 0
+        # Particles closer than repulsion_distance push each other apart, 0 turns it off
+        self.repulsion_strength = repulsion_strength
+        self.repulsion_distance = repulsion_distance
         
         # Create box
         self.box = RoundedRectangle(height=height, width=width, color=WHITE, corner_radius=.1)
         
-        # Create particles within box bounds
-        self.particles = VGroup(*[
-            Dot(
-                point=[
-                    np.random.uniform(-width/2 + 0.5, width/2 - 0.5),
-                    np.random.uniform(-height/2 + 0.5, height/2 - 0.5),
-                    0
-                ],
-                radius=0.05,
-                color=WHITE
-            )
-            for _ in range(num_particles)
-        ])
+        # Create particles within box bounds, positions are the cloud's points
+        rng = step_stream(scene, f"{name}/positions", 0)
+        positions = np.zeros((num_particles, 3))
+        positions[:, 0] = rng.uniform(-width/2 + 0.5, width/2 - 0.5, num_particles)
+        positions[:, 1] = rng.uniform(-height/2 + 0.5, height/2 - 0.5, num_particles)
+        self.particles = ParticleCloud(positions, radius=self.particle_radius, color=WHITE)
         
         # Add label
         self.label = MarkupText("<b>noise</b>", font="Helvetica", font_size=100, color=WHITE).next_to(self.box, UP)
         
-        # Add everything to the VGroup
+        # Add everything to the Group
         self.add(self.box, self.particles, self.label)
     
     def move_to(self, point):
@@ -53,6 +63,7 @@ class NoiseBox(VGroup):
         """Override scale to update internal scale tracking"""
         self.scale_factor *= scale_factor
         super().scale(scale_factor, **kwargs)
+        self.particles.set_radius(self.particle_radius * self.scale_factor)
         return self
         
     def start_animation(self):
@@ -64,39 +75,52 @@ class NoiseBox(VGroup):
         self.particles.clear_updaters()
         
     def update_particles(self, mob, dt):
-        """Update particle positions with bouncing behavior, accounting for scale"""
+        """Walk the particles one step per frame up to the current frame.
+
+        Which frame that is comes from the scene's plays, not from adding up dt.
+        A play manim or the segment cache skips calls this once with the whole
+        run_time as dt, and still ends on the same step, with the same draws, as
+        rendering every frame of it, so the plays after it hash and look the same.
+        Without a scene it adds up dt, which skipped plays throw off.
+        """
+        target = self.target_step(dt)
+        while self.steps < target:
+            self.step(mob, step_stream(self.scene, f"{self.name}/steps", self.steps), 1 / config.frame_rate)
+            self.steps += 1
+
+    def target_step(self, dt):
+        if self.scene is None:
+            self.elapsed += dt
+            return round(self.elapsed * config.frame_rate)
+        renderer = self.scene.renderer
+        if renderer.num_plays != self.play:
+            self.play_start += self.play_frames
+            self.play = renderer.num_plays
+        # The frames manim renders for this play, t = 0, 1/fps, ... below its duration
+        self.play_frames = len(np.arange(0, self.scene.duration, 1 / config.frame_rate))
+        # A skipped play updates once at t = duration, the last rendered frame is one before that
+        return self.play_start + min(round(self.scene.last_t * config.frame_rate), self.play_frames - 1)
+
+    def step(self, mob, rng, dt):
+        """Random step for every particle at once, kept inside the walls, accounting for scale"""
         box_center = self.box.get_center()
-        effective_width = self.box_width * self.scale_factor
-        effective_height = self.box_height * self.scale_factor
         
-        for particle in mob:
-            # Random movement scaled by the current scale factor
-            velocity = np.array([
-                np.random.uniform(-2, 2) * self.scale_factor,
-                np.random.uniform(-2, 2) * self.scale_factor,
-                0
-            ])
-            new_pos = particle.get_center() + velocity * dt
-            
-            # Calculate bounds relative to box center
-            bounds_x = effective_width/2 - 0.5 * self.scale_factor
-            bounds_y = effective_height/2 - 0.5 * self.scale_factor
-            
-            # Bounce off walls, relative to box center
-            relative_x = new_pos[0] - box_center[0]
-            relative_y = new_pos[1] - box_center[1]
-            
-            if abs(relative_x) > bounds_x:
-                velocity[0] *= -1
-                relative_x = np.clip(relative_x, -bounds_x, bounds_x)
-                new_pos[0] = box_center[0] + relative_x
-                
-            if abs(relative_y) > bounds_y:
-                velocity[1] *= -1
-                relative_y = np.clip(relative_y, -bounds_y, bounds_y)
-                new_pos[1] = box_center[1] + relative_y
-            
-            particle.move_to(new_pos)
+        # Random movement scaled by the current scale factor
+        velocities = np.zeros_like(mob.points)
+        velocities[:, :2] = rng.uniform(-2, 2, (len(mob.points), 2)) * self.scale_factor
+        if self.repulsion_strength:
+            velocities += repulsion(mob.points, self.repulsion_distance * self.scale_factor, self.repulsion_strength * self.scale_factor)
+        relative = mob.points + velocities * dt - box_center
+        
+        # Bounds relative to box center, z stays flat
+        bounds = np.array([
+            (self.box_width / 2 - 0.5) * self.scale_factor,
+            (self.box_height / 2 - 0.5) * self.scale_factor,
+            0
+        ])
+        
+        # Stop at the walls, the next step draws new velocities anyway
+        mob.points = box_center + np.clip(relative, -bounds, bounds)
 
 class CommunicationModel(Scene):
     def construct(self):
@@ -124,7 +148,7 @@ class CommunicationModel(Scene):
         person_text = MarkupText("<b>Sender's Field of Experience</b>", font="Helvetica").scale(.6).set_color(GREY_E)
         llm_text = MarkupText("<b>Receiver's Field of Experience</b>", font="Helvetica").scale(.6).set_color(GREY_E)
 
-        noise_box = NoiseBox()
+        noise_box = NoiseBox(scene=self, name="noise")
         noise_box.move_to(ORIGIN + [0, 2.3, 0]).scale(0.3)
         # Create signal rectangle
         signal = RoundedRectangle(height=1.5, width=2, color=box_color, fill_opacity=1, corner_radius=.1)
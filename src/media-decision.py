@@ -1,4 +1,6 @@
 from manim import *
+from svg_assets import SVGMobject
+from raster_assets import ImageMobject
 import os
 from probability import FormulaInBox
 
@@ -19,7 +21,7 @@ class DecisionTreeAnimation(Scene):
 
         prob = FormulaInBox()
         formula_group = prob.create_formula()
-        schramm = ImageMobject(f"{asset_folder}/schramm.jpg").scale(0.4)
+        schramm = ImageMobject(f"{asset_folder}/schramm.jpg", scale=0.4)
         schramm.move_to(UP * 2.5 + LEFT * 2.5).set_opacity(0)
         schramm_label = MarkupText("<b>Wilbur Schramm</b>", font_size=24, color=BLACK, font="Helvetica")
         schramm_label.move_to(UP * 2.5).set_opacity(0)
@@ -0,0 +1,27 @@
+"""Draw ParticleClouds the size of their radius as seen through the camera's frame.
+
+manim draws point clouds as squares a fixed number of pixels across, so a
+ParticleCloud (see particles.py) is sized for the default frame and stays that
+size when a MovingCamera zooms in, where the Dots it replaces would grow. This
+hook draws each cloud ``cloud.pixel_width(camera)`` pixels across, from its
+radius and the frame of whichever camera is drawing it. Other point clouds are
+drawn as before. Scenes that zoom over particles turn it on in render.py's
+SCENE_HOOKS, or by hand:
+
+    RENDER_HOOKS=particle_zoom python src/run_manim.py render src/filter.py FilterAnimation
+"""
+from manim.camera.camera import Camera
+
+from hooks import patch
+from particles import ParticleCloud
+
+
+def install():
+    @patch(Camera, "display_multiple_point_cloud_mobjects")
+    def display_multiple_point_cloud_mobjects(original, self, pmobjects, pixel_array):
+        # One at a time, in order, so clouds and other point clouds still overlap the way they're listed
+        for pmobject in pmobjects:
+            if isinstance(pmobject, ParticleCloud):
+                self.display_point_cloud(pmobject, pmobject.points, pmobject.rgbas, pmobject.pixel_width(self), pixel_array)
+            else:
+                original(self, [pmobject], pixel_array)
@@ -0,0 +1,223 @@
+"""Particle systems drawn as one point cloud instead of one Dot per particle.
+
+    from particles import MoveParticles, ParticleCloud, ParticleField, repulsion
+
+    cloud = ParticleCloud(positions, radius=0.05, color=WHITE)
+    cloud.points[:, :2] += steps        # move every particle at once
+    cloud.points += repulsion(cloud.points, distance=0.2, strength=0.5) * dt
+
+A ParticleCloud is a single PMobject whose points are the particle positions,
+so updaters move all of them with one NumPy operation and the camera draws
+them all in one pass, each as a small square of pixels the size of a Dot of
+``radius``. It is not a VMobject, so it goes in a Group rather than a VGroup.
+The camera writes its pixels instead of blending them. manim draws points a
+fixed number of pixels across, so they keep their size when a MovingCamera
+zooms, unless the particle_zoom hook is installed (see particle_zoom.py).
+
+A ParticleField is a cloud where every particle travels from a start to a
+target position with its own opacity, delay and run time, all kept as arrays.
+MoveParticles plays it, computing every position in one step per frame:
+
+    field = ParticleField(starts, targets, opacities, color=BLUE_D, run_times=rng.uniform(1, 3, n))
+    self.play(MoveParticles(field))
+
+Pushes from updaters go through ``field.push(displacement)``, which keeps them
+as offsets added on top of the motion, so they add up over the frames instead
+of being overwritten by the next set_time:
+
+    field.add_updater(lambda field, dt: field.push(repulsion(field.points, 0.5, 2.0) * dt))
+
+repulsion() finds the pairs of particles closer than ``distance`` with a
+uniform grid of ``distance`` sized cells, so it only compares particles in
+neighbouring cells and costs about O(n) at a fixed density instead of O(n²).
+Running this file benchmarks it against comparing every pair:
+
+    uv run python src/particles.py
+    uv run python src/particles.py --counts 1000 50000 --frames 30
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from manim import WHITE, Animation, PMobject, config, linear
+from manim.utils.color import color_to_rgb
+
+# Cells of the grid that pair with a cell without counting a pair twice: itself and 4 of its 8 neighbours
+HALF_NEIGHBOURS = [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]
+
+
+class ParticleCloud(PMobject):
+    def __init__(self, positions, radius=0.05, color=WHITE, **kwargs):
+        super().__init__(**kwargs)
+        self.add_points(np.asarray(positions, dtype=float), color=color)
+        self.set_radius(radius)
+
+    def set_radius(self, radius):
+        self.radius = radius
+        # The camera draws each point as a square stroke_width pixels across, sized for the default frame
+        self.stroke_width = max(1, round(2 * radius * config.pixel_height / config.frame_height))
+        return self
+
+    def pixel_width(self, camera):
+        """Pixels across ``camera`` draws each particle, a Dot of ``radius`` seen through its current frame."""
+        return max(1, round(2 * self.radius * camera.pixel_height / camera.frame_height))
+
+
+class ParticleField(ParticleCloud):
+    def __init__(self, starts, targets, opacities=1, color=WHITE, background=WHITE, delays=0, run_times=1, rate_func=linear, **kwargs):
+        """``rate_func`` gets an array of every particle's progress, so it has to be written with NumPy operations."""
+        self.starts = np.asarray(starts, dtype=float)
+        self.targets = np.asarray(targets, dtype=float)
+        count = len(self.starts)
+        self.delays = np.broadcast_to(np.asarray(delays, dtype=float), count)
+        self.run_times = np.broadcast_to(np.asarray(run_times, dtype=float), count)
+        self.rate_func = rate_func
+        super().__init__(self.starts.copy(), color=color, **kwargs)
+        # Accumulated pushes, added to wherever the motion puts each particle
+        self.offsets = np.zeros_like(self.starts)
+        self.set_opacities(opacities, color, background)
+
+    @property
+    def duration(self):
+        return float(np.max(self.delays + self.run_times, initial=0))
+
+    def set_opacities(self, opacities, color, background):
+        # Point clouds overwrite the pixels under them, so blend with the background up front
+        opacities = np.broadcast_to(np.asarray(opacities, dtype=float), len(self.points))[:, None]
+        self.rgbas[:, :3] = opacities * color_to_rgb(color) + (1 - opacities) * color_to_rgb(background)
+        self.rgbas[:, 3] = 1
+        return self
+
+    def set_time(self, time):
+        """Put every particle where it is ``time`` seconds into the field's motion."""
+        progress = self.rate_func(np.clip((time - self.delays) / self.run_times, 0, 1))
+        self.points = self.starts + (self.targets - self.starts) * progress[:, None] + self.offsets
+        return self
+
+    def push(self, displacement):
+        """Move every particle by ``displacement``, (n, 3), from now on."""
+        self.offsets += displacement
+        self.points += displacement
+        return self
+
+
+class MoveParticles(Animation):
+    def __init__(self, field, **kwargs):
+        kwargs.setdefault("run_time", field.duration)
+        # The field's own rate_func eases each particle, the animation just runs the clock
+        kwargs.setdefault("rate_func", linear)
+        # Updaters (repulsion) keep running, on top of where the motion puts the particles
+        kwargs.setdefault("suspend_mobject_updating", False)
+        super().__init__(field, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.set_time(self.rate_func(alpha) * self.run_time)
+
+
+def neighbour_pairs(points, distance):
+    """Indices (i, j), i != j, of every pair of points whose x/y are less than ``distance`` apart, each pair once."""
+    if len(points) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    cells = np.floor(points[:, :2] / distance).astype(np.int64)
+    # One more column on each side, so stepping to a neighbour never wraps into the next row
+    cells -= cells.min(axis=0) - 1
+    rows = cells[:, 1].max() + 2
+    keys = cells[:, 0] * rows + cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    pairs_i, pairs_j = [], []
+    for dx, dy in HALF_NEIGHBOURS:
+        neighbour_keys = keys + dx * rows + dy
+        starts = np.searchsorted(sorted_keys, neighbour_keys, side="left")
+        counts = np.searchsorted(sorted_keys, neighbour_keys, side="right") - starts
+        total = counts.sum()
+        if not total:
+            continue
+        # Every particle paired with every particle in that cell, without a Python loop
+        i = np.repeat(np.arange(len(points)), counts)
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        j = order[np.repeat(starts, counts) + within]
+        if (dx, dy) == (0, 0):
+            keep = i < j
+            i, j = i[keep], j[keep]
+        pairs_i.append(i)
+        pairs_j.append(j)
+    if not pairs_i:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    i, j = np.concatenate(pairs_i), np.concatenate(pairs_j)
+    offsets = points[i, :2] - points[j, :2]
+    close = np.einsum("ij,ij->i", offsets, offsets) < distance**2
+    return i[close], j[close]
+
+
+def repulsion(points, distance, strength):
+    """Push on each point, (n, 3), away from every point closer than ``distance``.
+
+    Falls off linearly from ``strength`` when two points touch to 0 at ``distance``.
+    Points exactly on top of each other don't push, there is no direction to push in.
+    """
+    push = np.zeros_like(points, dtype=float)
+    i, j = neighbour_pairs(points, distance)
+    offsets = points[i, :2] - points[j, :2]
+    lengths = np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+    apart = lengths > 0
+    i, j, offsets, lengths = i[apart], j[apart], offsets[apart], lengths[apart]
+    forces = offsets * (strength * (1 - lengths / distance) / lengths)[:, None]
+    for axis in range(2):
+        push[:, axis] += np.bincount(i, forces[:, axis], minlength=len(points))
+        push[:, axis] -= np.bincount(j, forces[:, axis], minlength=len(points))
+    return push
+
+
+def brute_force_repulsion(points, distance, strength):
+    """Same as repulsion(), comparing every pair. For checking and benchmarking only."""
+    offsets = points[:, None, :2] - points[None, :, :2]
+    lengths = np.sqrt((offsets**2).sum(axis=2))
+    close = (lengths < distance) & (lengths > 0)
+    scale = np.where(close, strength * (1 - lengths / distance) / np.where(close, lengths, 1), 0)
+    push = np.zeros_like(points, dtype=float)
+    push[:, :2] = (offsets * scale[:, :, None]).sum(axis=1)
+    return push
+
+
+def benchmark(counts, frames, density, distance, brute_force_limit):
+    """Seconds per frame of repulsion() for each particle count, at a fixed number of particles per unit area."""
+    rng = np.random.default_rng(0)
+    print(f"{'particles':>9} {'pairs':>9} {'grid ms':>9} {'us/particle':>11} {'all pairs ms':>12}")
+    for count in counts:
+        side = np.sqrt(count / density)
+        points = np.zeros((count, 3))
+        points[:, :2] = rng.uniform(0, side, (count, 2))
+        pairs = len(neighbour_pairs(points, distance)[0])
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            push = repulsion(points, distance, 1.0)
+        grid = (time.perf_counter() - start) / frames
+
+        brute = ""
+        if count <= brute_force_limit:
+            start = time.perf_counter()
+            expected = brute_force_repulsion(points, distance, 1.0)
+            brute = f"{(time.perf_counter() - start) * 1000:12.2f}"
+            assert np.allclose(push, expected), "grid and all pairs disagree"
+        print(f"{count:>9} {pairs:>9} {grid * 1000:9.2f} {grid / count * 1e6:11.2f} {brute:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 5000, 10000, 20000, 50000])
+    parser.add_argument("--frames", type=int, default=20, help="frames to average over")
+    parser.add_argument("--density", type=float, default=100, help="particles per unit area")
+    parser.add_argument("--distance", type=float, default=0.2, help="repulsion distance")
+    parser.add_argument("--brute-force-limit", type=int, default=5000, help="largest count to also compare every pair for")
+    args = parser.parse_args(argv)
+    benchmark(args.counts, args.frames, args.density, args.distance, args.brute_force_limit)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Time every play()/wait() call, split into phases, attributed to the line in the scene that made it.
+
+Phases, all on the scene's thread unless noted:
+
+    updaters       mobject and scene updaters (NoiseBox.update_particles, ...)
+    interpolation  Animation.interpolate, i.e. interpolate_mobject of every animation
+    rasterization  drawing frames with cairo
+    hashing        manim hashing the play() call for its partial movie cache
+    encoder_wait   end of the play, waiting for the encoder to catch up
+    encoding       x264 on manim's writer thread, overlaps the others
+
+Time spent in an inner phase (an updater run during an interpolation) only counts
+for the inner one. Whatever is left of a play is "other": animation setup, the
+static background, bookkeeping.
+
+As a render hook (RENDER_HOOKS=play_profile) it writes, for each scene, to
+RENDER_PROFILE (default media/profiles/):
+
+    <module>.<Scene>.plays.json    one record per play, for the report below
+    <module>.<Scene>.trace.json    Chrome trace events, open in chrome://tracing or ui.perfetto.dev
+
+    uv run python src/play_profile.py media/profiles/bandwidth.SimpleRateComparison.plays.json
+    uv run python src/play_profile.py <plays.json> --sort rasterization --by play --top 10
+"""
+import argparse
+import json
+import linecache
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+profile_folder = repo_root / "media" / "profiles"
+
+PHASES = ["updaters", "interpolation", "rasterization", "hashing", "encoder_wait", "encoding"]
+# encoding runs on another thread, so it isn't part of the scene thread's time
+SCENE_THREAD_PHASES = [phase for phase in PHASES if phase != "encoding"]
+
+
+class PlayProfiler:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.plays = []
+        self.events = []
+        self.current = None
+        # [phase, start, resumed, exclusive seconds] for the phases the scene thread is in
+        self.stack = []
+        self.scene_thread = threading.get_ident()
+
+    def now(self):
+        return time.perf_counter() - self.origin
+
+    def begin_play(self, index, location, code):
+        self.current = {
+            "index": index,
+            "location": location,
+            "code": code,
+            "start": self.now(),
+            "frames": 0,
+            "phases": dict.fromkeys(PHASES, 0.0),
+        }
+
+    def end_play(self):
+        play = self.current
+        play["total"] = self.now() - play["start"]
+        play["phases"]["other"] = max(0.0, play["total"] - sum(play["phases"][phase] for phase in SCENE_THREAD_PHASES))
+        self.plays.append(play)
+        self.events.append(self.event(f"play {play['index']} {play['location']}", play["start"], play["total"], code=play["code"]))
+        self.current = None
+
+    def enter(self, phase):
+        now = self.now()
+        if self.stack:
+            parent = self.stack[-1]
+            parent[3] += now - parent[2]
+        self.stack.append([phase, now, now, 0.0])
+
+    def exit(self):
+        now = self.now()
+        phase, start, resumed, exclusive = self.stack.pop()
+        if self.current is not None:
+            self.current["phases"][phase] += exclusive + now - resumed
+            # Only the outermost phase makes a trace event, NoiseBox would otherwise emit thousands per frame
+            if not self.stack:
+                self.events.append(self.event(phase, start, now - start))
+        if self.stack:
+            self.stack[-1][2] = now
+
+    def add_encoding(self, start, duration):
+        """Called from the writer thread."""
+        play = self.current
+        if play is not None:
+            play["phases"]["encoding"] += duration
+            self.events.append(self.event("encoding", start, duration, tid=2))
+
+    @staticmethod
+    def event(name, start, duration, tid=1, **args):
+        return {"name": name, "ph": "X", "ts": round(start * 1e6), "dur": round(duration * 1e6), "pid": 1, "tid": tid, "args": args}
+
+    def trace(self, scene_name):
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": scene_name}},
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "scene"}},
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": 2, "args": {"name": "encoder"}},
+        ]
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+
+def call_site(scene, skip_files):
+    """'file.py:line' and source of the scene code that called play(), preferring the scene's own module."""
+    scene_file = getattr(sys.modules.get(type(scene).__module__), "__file__", None)
+    manim_folder = str(Path(sys.modules["manim"].__file__).parent)
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename == scene_file:
+            fallback = frame
+            break
+        if fallback is None and not filename.startswith(manim_folder) and filename not in skip_files:
+            fallback = frame
+        frame = frame.f_back
+    if fallback is None:
+        return "?", ""
+    filename, lineno = fallback.f_code.co_filename, fallback.f_lineno
+    return f"{Path(filename).name}:{lineno}", linecache.getline(filename, lineno).strip()
+
+
+def install():
+    from manim import Animation, AnimationGroup, Scene, Succession, Wait, logger
+    from manim.renderer import cairo_renderer
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    import hooks
+    from hooks import patch
+
+    output_folder = Path(os.environ.get("RENDER_PROFILE") or profile_folder)
+    profiler = PlayProfiler()
+    skip_files = {__file__, hooks.__file__}
+
+    def timed(owner, name, phase):
+        # Only patch classes that define the method, subclasses would otherwise be timed twice
+        if isinstance(owner, type) and name not in owner.__dict__:
+            return
+
+        @patch(owner, name)
+        def wrapper(original, *args, **kwargs):
+            if threading.get_ident() != profiler.scene_thread:
+                return original(*args, **kwargs)
+            profiler.enter(phase)
+            try:
+                return original(*args, **kwargs)
+            finally:
+                profiler.exit()
+
+    for cls in (Animation, AnimationGroup, Succession, Wait):
+        timed(cls, "update_mobjects", "updaters")
+        timed(cls, "interpolate", "interpolation")
+    timed(Scene, "update_mobjects", "updaters")
+    timed(CairoRenderer, "update_frame", "rasterization")
+    timed(cairo_renderer, "get_hash_from_play_call", "hashing")
+    timed(SceneFileWriter, "close_partial_movie_stream", "encoder_wait")
+
+    @patch(CairoRenderer, "play")
+    def play(original, self, scene, *args, **kwargs):
+        profiler.begin_play(self.num_plays, *call_site(scene, skip_files))
+        try:
+            original(self, scene, *args, **kwargs)
+        finally:
+            profiler.end_play()
+
+    @patch(CairoRenderer, "add_frame")
+    def add_frame(original, self, frame, num_frames=1):
+        if profiler.current is not None and not self.skip_animations:
+            profiler.current["frames"] += num_frames
+        original(self, frame, num_frames)
+
+    @patch(SceneFileWriter, "encode_and_write_frame")
+    def encode_and_write_frame(original, self, frame, num_frames):
+        start = profiler.now()
+        original(self, frame, num_frames)
+        profiler.add_encoding(start, profiler.now() - start)
+
+    @patch(CairoRenderer, "scene_finished")
+    def scene_finished(original, self, scene):
+        original(self, scene)
+        scene_name = f"{type(scene).__module__}.{type(scene).__name__}"
+        output_folder.mkdir(parents=True, exist_ok=True)
+        plays_path = output_folder / f"{scene_name}.plays.json"
+        plays_path.write_text(json.dumps({"scene": scene_name, "plays": profiler.plays}, indent=1))
+        (output_folder / f"{scene_name}.trace.json").write_text(json.dumps(profiler.trace(scene_name)))
+        logger.info("Play profile written to %(path)s, slowest lines:\n%(report)s", {"path": plays_path, "report": format_report(profiler.plays, top=10)})
+
+
+def group_plays(plays, by):
+    """Sum plays that come from the same source line (a play() in a loop), or keep them one per row."""
+    if by == "play":
+        return [dict(play, count=1) for play in plays]
+    rows = {}
+    for play in plays:
+        row = rows.setdefault(play["location"], {
+            "location": play["location"], "code": play["code"], "count": 0, "frames": 0, "total": 0.0,
+            "phases": dict.fromkeys([*PHASES, "other"], 0.0),
+        })
+        row["count"] += 1
+        row["frames"] += play["frames"]
+        row["total"] += play["total"]
+        for phase, seconds in play["phases"].items():
+            row["phases"][phase] += seconds
+    return list(rows.values())
+
+
+def format_report(plays, sort="total", by="line", top=None):
+    rows = group_plays(plays, by)
+    rows.sort(key=lambda row: row["phases"][sort] if sort in row["phases"] else row[sort], reverse=True)
+    columns = [*PHASES, "other"]
+    header = f"{'location':<24} {'plays':>5} {'frames':>6} {'total':>8} " + " ".join(f"{column:>{max(8, len(column))}}" for column in columns) + "  code"
+    lines = [header]
+    for row in rows[:top]:
+        location = row["location"] if by == "line" else f"#{row['index']} {row['location']}"
+        lines.append(
+            f"{location:<24} {row['count']:>5} {row['frames']:>6} {row['total']:>8.3f} "
+            + " ".join(f"{row['phases'][column]:>{max(8, len(column))}.3f}" for column in columns)
+            + f"  {row['code'][:60]}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("plays", type=Path, help="a .plays.json file written by the hook")
+    parser.add_argument("--sort", default="total", choices=["total", "frames", "count", *PHASES, "other"])
+    parser.add_argument("--by", default="line", choices=["line", "play"], help="sum plays from the same source line, or list every play")
+    parser.add_argument("--top", type=int, help="only show the slowest rows")
+    args = parser.parse_args(argv)
+    plays = json.loads(args.plays.read_text())["plays"]
+    print(format_report(plays, args.sort, args.by, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
 from manim import *
+from tex_cache import Tex
+from svg_assets import SVGMobject
 import numpy as np
 import random
 import os
@@ -0,0 +1,82 @@
+"""Images resampled once to the size they are drawn at, cached on disk per resolution.
+
+    from manim import *
+    from raster_assets import ImageMobject
+
+    schramm = ImageMobject(f"{asset_folder}/schramm.jpg", scale=0.4)
+
+manim keeps the whole decoded file as the mobject's pixel array and resizes it
+to its on-screen size with Pillow in every frame it is drawn in. mcp.png is
+3607x600 but takes up about 150 pixels of height at 1080p. Given the scale it
+will be shown at, this ImageMobject works out that pixel size for the render's
+resolution, plus OVERSAMPLE so a slight zoom stays sharp, and uses a copy of
+the image resampled to it. Resampled copies are saved as .npy and memory
+mapped copy-on-write, so a cached image costs neither decoding nor private
+memory until something (set_opacity, set_color) writes to it. Images are never
+upscaled. The mobject comes out the same size as
+``manim.ImageMobject(file).scale(scale)``.
+
+    RENDER_IMAGE_CACHE=.image-cache        location (default)
+"""
+import hashlib
+import math
+import os
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import manim
+from manim import config
+from manim.utils.images import change_to_rgba_array, get_full_raster_image_path
+
+repo_root = Path(__file__).resolve().parent.parent
+cache_folder = Path(os.environ.get("RENDER_IMAGE_CACHE", repo_root / ".image-cache"))
+
+# Resample to this much more than the on-screen size
+OVERSAMPLE = 1.25
+
+
+def resampled(path, size, image_mode):
+    """The image at ``path`` as an RGBA array of ``size`` (width, height), memory mapped from the cache."""
+    settings = repr((hashlib.sha256(path.read_bytes()).hexdigest(), size, image_mode))
+    cache_path = cache_folder / f"{hashlib.sha256(settings.encode()).hexdigest()}.npy"
+    if not cache_path.exists():
+        image = Image.open(path).convert(image_mode).resize(size, resample=Image.Resampling.LANCZOS)
+        pixels = change_to_rgba_array(np.array(image))
+        cache_folder.mkdir(parents=True, exist_ok=True)
+        # Via a temporary file so a concurrent render never reads half an entry
+        temporary = cache_path.with_name(f".{cache_path.stem}.{os.getpid()}.tmp.npy")
+        np.save(temporary, pixels)
+        os.replace(temporary, cache_path)
+    # Copy-on-write, so fading or recoloring the image never touches the file
+    return np.load(cache_path, mmap_mode="c")
+
+
+class ImageMobject(manim.ImageMobject):
+    def __init__(self, filename_or_array, scale=1, scale_to_resolution=manim.QUALITIES[manim.DEFAULT_QUALITY]["pixel_height"], image_mode="RGBA", **kwargs):
+        if isinstance(filename_or_array, np.ndarray):
+            super().__init__(filename_or_array, scale_to_resolution=scale_to_resolution, image_mode=image_mode, **kwargs)
+            self.scale(scale)
+            return
+
+        path = get_full_raster_image_path(filename_or_array)
+        with Image.open(path) as image:
+            width, height = image.size
+        # Same arithmetic as manim's reset_points: the image is height / scale_to_resolution frame heights tall
+        screen_height = height * scale * config.pixel_height / scale_to_resolution
+        target_height = math.ceil(screen_height * OVERSAMPLE)
+        if target_height >= height:
+            super().__init__(path, scale_to_resolution=scale_to_resolution, image_mode=image_mode, **kwargs)
+            self.scale(scale)
+            return
+
+        target_width = max(1, round(width * target_height / height))
+        pixels = resampled(path, (target_width, target_height), image_mode)
+        # Fewer pixel rows, so fewer rows per frame height keeps the mobject the same size
+        super().__init__(pixels, scale_to_resolution=scale_to_resolution * target_height / height, image_mode=image_mode, **kwargs)
+        if not self.invert_image:
+            # manim copied it, keep the memory mapped array instead
+            self.pixel_array = pixels
+        self.path = path
+        self.scale(scale)
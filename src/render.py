@@ -0,0 +1,418 @@
+"""Render every scene in the repo in parallel and refresh the README assets.
+
+Run from the repo root:
+
+    uv run python src/render.py --workers 8
+    uv run python src/render.py --only curly-mcp --profiles gif
+    uv run python src/render.py --encode-many   # rasterize each scene once for all profiles
+    uv run python src/render.py --shards 8      # split each scene's timeline over 8 processes
+
+Finished renders are cached in .render-cache/ (see render_cache.py), so scenes
+whose sources, assets and toolchain haven't changed are not rendered again.
+Individual play() segments are cached in .segment-cache/ (see segment_cache.py),
+so a scene that did change only re-renders the segments that are different.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import gif_export
+import hooks
+import shards
+import tex_precompile
+from render_cache import RenderCache, scene_key, source_manifest
+
+repo_root = Path(__file__).resolve().parent.parent
+src_folder = repo_root / "src"
+media_folder = repo_root / "media"
+assets_folder = repo_root / "assets"
+log_folder = media_folder / "logs" / "render"
+
+# (module, scene, README gif name)
+SCENES = [
+    ("manim-communication", "CommunicationModel", "communication.gif"),
+    ("media-decision", "DecisionTreeAnimation", "media-decision.gif"),
+    ("radar-chart", "MultipleRadarCharts", "radar-chart.gif"),
+    ("curly", "CurlyBraceTransformation", "curly.gif"),
+    ("curly-mcp", "CurlyBraceTransformation", "curly-mcp.gif"),
+    ("filter", "FilterAnimation", "filter.gif"),
+    ("tokenwindow", "ContextWindowAnimation", "tokenwindow.gif"),
+    ("programmer-loading", "IdeaLoadingAnimation", "programmer-loading.gif"),
+]
+
+# Hooks a scene needs to render as written, installed before the render's own
+SCENE_HOOKS = {
+    # Zooms its camera 10x over the background particles, they should grow with it
+    ("filter", "FilterAnimation"): ("particle_zoom",),
+}
+
+# Output profiles, same flags generate_videos.sh used to pass to manim
+PROFILES = {
+    "gif": {"resolution": (320, 200), "format": "gif"},
+    "720p": {"resolution": (1280, 720), "format": "mp4"},
+}
+
+
+@dataclass(frozen=True)
+class Job:
+    module: str
+    scene: str
+    # The first profile is rasterized by manim, the rest are downscaled from its frames (see fanout.py)
+    profiles: tuple
+    asset: str | None = None
+    # Render hooks for run_manim.py, see hooks.py
+    hooks: tuple = ()
+    # (index, first play, last play) when rendering one time range of the scene, see shards.py
+    shard: tuple | None = None
+
+    @property
+    def base_name(self):
+        return f"{self.module}.{self.scene}.{'+'.join(self.profiles)}"
+
+    @property
+    def name(self):
+        return self.base_name if self.shard is None else f"{self.base_name}.shard{self.shard[0]:02}"
+
+    @property
+    def media_dir(self):
+        # Shards get their own video folders so concurrent shards never write the same partial movie file
+        return media_folder if self.shard is None else media_folder / "shards" / self.base_name / f"{self.shard[0]:02}"
+
+    @property
+    def config_file(self):
+        return self.media_dir / "manim.cfg"
+
+    def output_name(self, profile):
+        return f"{self.scene}_{profile}" if self.shard is None else f"{self.scene}_{profile}_shard{self.shard[0]:02}"
+
+    def format(self, profile):
+        # Shards are always movies so they can be joined with a stream copy
+        return PROFILES[profile]["format"] if self.shard is None else "mp4"
+
+
+@dataclass
+class JobResult:
+    job: Job
+    returncode: int
+    elapsed: float
+    log_path: Path | None
+    artifacts: dict = field(default_factory=dict)
+    cached: bool = False
+
+
+def pixel_count(profile):
+    width, height = PROFILES[profile]["resolution"]
+    return width * height
+
+
+def build_jobs(profiles=None, only=None, encode_many=False, hooks=()):
+    """One job per (module, scene, profile), or per (module, scene) when encoding many profiles from one render."""
+    profiles = profiles or list(PROFILES)
+    jobs = []
+    for module, scene, asset in SCENES:
+        if only and module not in only and scene not in only:
+            continue
+        scene_hooks = SCENE_HOOKS.get((module, scene), ()) + tuple(hooks)
+        if encode_many:
+            jobs.append(Job(module, scene, tuple(sorted(profiles, key=pixel_count, reverse=True)), asset, scene_hooks))
+        else:
+            jobs.extend(Job(module, scene, (profile,), asset, scene_hooks) for profile in profiles)
+    return jobs
+
+
+def manim_command(job):
+    primary = job.profiles[0]
+    width, height = PROFILES[primary]["resolution"]
+    command = [
+        sys.executable, str(src_folder / "run_manim.py"), "render",
+        "-r", f"{width},{height}",
+        f"--format={job.format(primary)}",
+        "--progress_bar", "none",
+        "-o", job.output_name(primary),
+    ]
+    if job.shard is not None:
+        command += ["--config_file", str(job.config_file), "-n", f"{job.shard[1]},{job.shard[2]}"]
+    return command + [str(src_folder / f"{job.module}.py"), job.scene]
+
+
+def timeline_command(job):
+    """Fast-forward through every play() without rasterizing, see timeline.py"""
+    width, height = PROFILES[job.profiles[0]]["resolution"]
+    return [
+        sys.executable, str(src_folder / "run_manim.py"), "render",
+        "-r", f"{width},{height}",
+        "--dry_run", "-n", "1000000",
+        "--progress_bar", "none",
+        str(src_folder / f"{job.module}.py"),
+        job.scene,
+    ]
+
+
+def manim_env(job):
+    env = dict(os.environ, RENDERING_MODE="True")
+    job_hooks = hooks.parse(env.get("RENDER_HOOKS")) + list(job.hooks)
+    if len(job.profiles) > 1:
+        job_hooks.append("fanout")
+        env["RENDER_FANOUT"] = ";".join(
+            f"{job.output_name(profile)}:{'x'.join(map(str, PROFILES[profile]['resolution']))}:{job.format(profile)}"
+            for profile in job.profiles[1:]
+        )
+    if job_hooks:
+        env["RENDER_HOOKS"] = ",".join(job_hooks)
+    return env
+
+
+def find_artifact(job, profile):
+    """Locate the file manim wrote, e.g. media/videos/curly/200p60/CurlyBraceTransformation_gif.gif"""
+    height = PROFILES[profile]["resolution"][1]
+    extension = job.format(profile)
+    matches = sorted((job.media_dir / "videos" / job.module).glob(f"{height}p*/{job.output_name(profile)}.{extension}"))
+    return matches[-1] if matches else None
+
+
+def write_shard_config(job):
+    """Point the shard's videos at its own folder, keeping the Tex and text caches in media/ shared."""
+    job.media_dir.mkdir(parents=True, exist_ok=True)
+    video_dir = (job.media_dir / "videos").relative_to(media_folder).as_posix()
+    job.config_file.write_text(f"[CLI]\nvideo_dir = {{media_dir}}/{video_dir}/{{module_name}}/{{quality}}\n")
+
+
+def run_job(job):
+    """Render a single job in a manim subprocess, logging its output to a file."""
+    log_folder.mkdir(parents=True, exist_ok=True)
+    if job.shard is not None:
+        write_shard_config(job)
+    log_path = log_folder / f"{job.name}.log"
+    start = time.perf_counter()
+    with open(log_path, "w") as log:
+        log.write(" ".join(manim_command(job)) + "\n\n")
+        log.flush()
+        process = subprocess.run(manim_command(job), cwd=repo_root, env=manim_env(job), stdout=log, stderr=subprocess.STDOUT)
+    elapsed = time.perf_counter() - start
+    artifacts = {}
+    if process.returncode == 0:
+        artifacts = {profile: find_artifact(job, profile) for profile in job.profiles}
+    return JobResult(job, process.returncode, elapsed, log_path, artifacts)
+
+
+def plan_job(job, shard_count):
+    """Time every play() of the scene and split it into shard jobs. Returns (returncode, shard jobs, log path)."""
+    log_folder.mkdir(parents=True, exist_ok=True)
+    log_path = log_folder / f"{job.name}.plan.log"
+    timeline_path = log_folder / f"{job.name}.timeline.json"
+    env = dict(os.environ, RENDERING_MODE="True", RENDER_HOOKS="timeline", RENDER_TIMELINE=str(timeline_path))
+    with open(log_path, "w") as log:
+        log.write(" ".join(timeline_command(job)) + "\n\n")
+        log.flush()
+        process = subprocess.run(timeline_command(job), cwd=repo_root, env=env, stdout=log, stderr=subprocess.STDOUT)
+    if process.returncode != 0:
+        return process.returncode, [], log_path
+    durations = json.loads(timeline_path.read_text())["durations"]
+    ranges = shards.plan(durations, shard_count) if durations else [(0, -1)]
+    shard_jobs = [
+        Job(job.module, job.scene, job.profiles, job.asset, job.hooks, (index, first, last))
+        for index, (first, last) in enumerate(ranges)
+    ]
+    return 0, shard_jobs, log_path
+
+
+def join_job(job, shard_results):
+    """Concatenate the shard movies of each profile, converting to gif where the profile asks for one."""
+    log_path = log_folder / f"{job.name}.join.log"
+    output_folder = media_folder / "videos" / job.module / "sharded"
+    output_folder.mkdir(parents=True, exist_ok=True)
+    shard_results = sorted(shard_results, key=lambda result: result.job.shard[0])
+    artifacts = {}
+    try:
+        for profile in job.profiles:
+            movies = [result.artifacts[profile] for result in shard_results]
+            movie_path = output_folder / f"{job.output_name(profile)}.mp4"
+            shards.concat(movies, movie_path)
+            artifacts[profile] = movie_path
+            if PROFILES[profile]["format"] == "gif":
+                artifacts[profile] = movie_path.with_suffix(".gif")
+                gif_export.write_gif([movie_path], artifacts[profile], gif_export.default_fps())
+    except Exception:
+        log_path.write_text(traceback.format_exc())
+        return JobResult(job, 1, 0.0, log_path)
+    return JobResult(job, 0, 0.0, log_path, artifacts)
+
+
+def run_sharded(pool, jobs, shard_count, finish):
+    """Plan, render and join each job's shards, keeping the pool busy across jobs."""
+    started = {job: time.perf_counter() for job in jobs}
+    futures = {pool.submit(plan_job, job, shard_count): ("plan", job) for job in jobs}
+    shard_jobs = {}
+    shard_results = {job: [] for job in jobs}
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            stage, job = futures.pop(future)
+            elapsed = time.perf_counter() - started[job]
+            if stage == "plan":
+                returncode, shard_jobs[job], log_path = future.result()
+                if returncode != 0:
+                    finish(JobResult(job, returncode, elapsed, log_path))
+                    continue
+                print(f"{job.name}: split into {len(shard_jobs[job])} shards")
+                for shard_job in shard_jobs[job]:
+                    futures[pool.submit(run_job, shard_job)] = ("shard", job)
+            elif stage == "shard":
+                shard_results[job].append(future.result())
+                if len(shard_results[job]) < len(shard_jobs[job]):
+                    continue
+                failed = [result for result in shard_results[job] if result.returncode != 0]
+                if failed:
+                    finish(JobResult(job, failed[0].returncode, elapsed, failed[0].log_path))
+                else:
+                    futures[pool.submit(join_job, job, shard_results[job])] = ("join", job)
+            else:
+                result = future.result()
+                result.elapsed = elapsed
+                finish(result)
+
+
+def copy_readme_assets(results):
+    for result in results:
+        if not result.job.asset:
+            continue
+        for profile, artifact in result.artifacts.items():
+            if artifact and PROFILES[profile]["format"] == "gif":
+                shutil.copyfile(artifact, assets_folder / result.job.asset)
+                print(f"copied {artifact.relative_to(repo_root)} -> assets/{result.job.asset}")
+
+
+def cache_names(job, key):
+    return {profile: f"{key}-{profile}.{PROFILES[profile]['format']}" for profile in job.profiles}
+
+
+def job_key(job):
+    job_hooks = hooks.parse(manim_env(job).get("RENDER_HOOKS"))
+    settings = {
+        "profiles": [[profile, PROFILES[profile]] for profile in job.profiles],
+        "hooks": ",".join(job_hooks),
+        # The hooks change the output too, a fix to one has to re-render what it touched
+        "hook_sources": source_manifest("run_manim", "hooks", *job_hooks),
+        "gif_fps": gif_export.default_fps(),
+        "seed": os.environ.get("RENDER_SEED"),
+    }
+    return scene_key(job.module, job.scene, settings)
+
+
+def run_jobs(jobs, workers, cache=None, shard_count=1, precompile_tex=True):
+    results = []
+    keys = {job: job_key(job) for job in jobs} if cache else {}
+
+    def finish(result):
+        status = "ok" if result.returncode == 0 else f"FAILED ({result.returncode})"
+        print(f"[{len(results) + 1}/{len(jobs)}] {result.job.name}: {status} in {result.elapsed:.1f}s")
+        if cache and result.returncode == 0 and all(result.artifacts.values()):
+            names = cache_names(result.job, keys[result.job])
+            for profile, artifact in result.artifacts.items():
+                cache.put(names[profile], artifact)
+        results.append(result)
+
+    pending = []
+    for job in jobs:
+        names = cache_names(job, keys[job]) if cache else {}
+        paths = cache.fetch(list(names.values())) if cache else None
+        if paths is None:
+            pending.append(job)
+            continue
+        artifacts = {profile: paths[name] for profile, name in names.items()}
+        results.append(JobResult(job, 0, 0.0, None, artifacts, cached=True))
+        print(f"[{len(results)}/{len(jobs)}] {job.name}: cached")
+
+    if precompile_tex and pending:
+        # Fill media/Tex up front, instead of every scene waiting on latex one string at a time
+        tex_precompile.precompile(sorted({(job.module, job.scene) for job in pending}), workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if shard_count > 1:
+            run_sharded(pool, pending, shard_count, finish)
+        else:
+            for future in as_completed([pool.submit(run_job, job) for job in pending]):
+                finish(future.result())
+    if cache:
+        cache.save()
+    return results
+
+
+def print_summary(results):
+    failed = [result for result in results if result.returncode != 0]
+    for result in failed:
+        print(f"{result.job.name} failed, see {result.log_path.relative_to(repo_root)}")
+    print(f"{len(results) - len(failed)}/{len(results)} jobs succeeded")
+    return failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of manim processes to run at once")
+    parser.add_argument("-p", "--profiles", nargs="+", choices=list(PROFILES), help="output profiles to render (default: all)")
+    parser.add_argument("--only", nargs="+", help="only render these modules or scene names")
+    parser.add_argument("--encode-many", action="store_true", help="rasterize each scene once at the largest profile and downscale for the others")
+    parser.add_argument("--shards", type=int, default=1, help="split each scene's timeline into this many ranges rendered in parallel")
+    parser.add_argument("--frame-workers", type=int, help="rasterize each scene's frames on this many processes (see frame_pool.py)")
+    parser.add_argument("--profile", action="store_true", help="time each play() by phase into media/profiles/ (see play_profile.py), skipping the caches")
+    parser.add_argument("--no-tex-precompile", action="store_true", help="let each scene compile its own LaTeX instead of compiling it all up front")
+    parser.add_argument("--no-cache", action="store_true", help="always render, ignoring and not updating .render-cache/")
+    parser.add_argument("--no-segment-cache", action="store_true", help="don't reuse play() segments from .segment-cache/")
+    parser.add_argument("--no-text-cache", action="store_true", help="don't reuse Text/MarkupText from .text-cache/")
+    parser.add_argument("--no-sprite-cache", action="store_true", help="rasterize every frame of periodic animations instead of reusing sprites")
+    parser.add_argument("--no-culling", action="store_true", help="draw mobjects outside the camera's frame too")
+    parser.add_argument("--no-static-layers", action="store_true", help="redraw everything above a moving mobject in every frame instead of caching it")
+    parser.add_argument("--no-hold-frames", action="store_true", help="encode every frame, even when it repeats the last one")
+    parser.add_argument("--gif-fps", type=float, help="frame rate of the gifs (default: same as the movie)")
+    parser.add_argument("--seed", type=int, help="seed for the scenes' random streams (default: each scene's seed attribute, or 0)")
+    parser.add_argument("--cache-size", type=int, default=2048, help="render cache size limit in MiB (default: 2048)")
+    parser.add_argument("--no-assets", action="store_true", help="don't copy the README gifs into assets/")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    job_hooks = [] if args.no_segment_cache else ["segment_cache"]
+    if not args.no_text_cache:
+        job_hooks.append("text_cache")
+    if not args.no_hold_frames:
+        job_hooks.append("hold_frames")
+    job_hooks.append("gif_export")
+    # Free for scenes that don't subclass ZoomedScene, and warns about ones that don't need to
+    job_hooks.append("lazy_zoom")
+    if args.gif_fps:
+        os.environ["RENDER_GIF_FPS"] = str(args.gif_fps)
+    if args.seed is not None:
+        os.environ["RENDER_SEED"] = str(args.seed)
+    if not args.no_culling:
+        job_hooks.append("culling")
+    if not args.no_static_layers:
+        job_hooks.append("static_layers")
+    if args.frame_workers:
+        job_hooks.append("frame_pool")
+        os.environ["RENDER_FRAME_WORKERS"] = str(args.frame_workers)
+    if not args.no_sprite_cache:
+        # Installed after frame_pool so it gets first pick of each frame
+        job_hooks.append("sprite_cache")
+    if args.profile:
+        # Every play has to actually run to be profiled
+        job_hooks = [name for name in job_hooks if name != "segment_cache"] + ["play_profile"]
+    jobs = build_jobs(args.profiles, args.only, args.encode_many, job_hooks)
+    cache = None if args.no_cache or args.profile else RenderCache(max_bytes=args.cache_size * 1024**2)
+    results = run_jobs(jobs, args.workers, cache, args.shards, not args.no_tex_precompile)
+    if not args.no_assets:
+        copy_readme_assets(results)
+    failed = print_summary(results)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Content-addressed cache of finished scene renders.
+
+A scene's key hashes its module source, the src/ modules it imports (recursively),
+every asset file it references, the manim toolchain versions pinned in uv.lock,
+the output profiles and the source of run_manim.py, hooks.py and every render
+hook the job enables. If nothing in that list changed, render.py copies the old
+artifact instead of starting manim.
+
+Several render.py runs can share the cache: index.json is merged with what's
+on disk under a lock when it's saved, instead of overwritten.
+
+    uv run python src/render_cache.py stats
+    uv run python src/render_cache.py clear
+"""
+import argparse
+import ast
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import tomllib
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+src_folder = repo_root / "src"
+cache_folder = repo_root / ".render-cache"
+
+# Where scenes look up the files they reference, in order
+ASSET_FOLDERS = [repo_root / "video_assets", repo_root]
+ASSET_EXTENSIONS = (".svg", ".png", ".jpg", ".jpeg", ".gif")
+TOOLCHAIN_PACKAGES = ["manim", "manim-ml", "manimpango"]
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def hash_file(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def local_imports(tree):
+    """Names of modules imported by the tree that live in src/, e.g. probability for media-decision.py"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split(".")[0])
+    return sorted(name for name in names if (src_folder / f"{name}.py").exists())
+
+
+def referenced_assets(tree):
+    """File names of the assets a module mentions, including the literal parts of f-strings.
+
+    f"{asset_folder}/decision.svg" and os.path.join(asset_folder, "neural2.svg") both count.
+    """
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value.lower().endswith(ASSET_EXTENSIONS):
+            names.add(Path(node.value).name)
+    return sorted(names)
+
+
+def find_asset(name):
+    for folder in ASSET_FOLDERS:
+        if (folder / name).exists():
+            return folder / name
+    return None
+
+
+def toolchain_versions(lock_path=repo_root / "uv.lock"):
+    with open(lock_path, "rb") as lock_file:
+        lock = tomllib.load(lock_file)
+    versions = {package["name"]: package.get("version") for package in lock.get("package", [])}
+    return {name: versions.get(name) for name in TOOLCHAIN_PACKAGES}
+
+
+def source_manifest(*modules):
+    """Everything the modules' renders depend on, as {label: content hash}."""
+    manifest = {}
+    pending = list(modules)
+    while pending:
+        name = pending.pop()
+        if f"src/{name}.py" in manifest:
+            continue
+        path = src_folder / f"{name}.py"
+        manifest[f"src/{name}.py"] = hash_file(path)
+        tree = ast.parse(path.read_text())
+        pending.extend(local_imports(tree))
+        for asset in referenced_assets(tree):
+            asset_path = find_asset(asset)
+            manifest[f"asset/{asset}"] = hash_file(asset_path) if asset_path else "missing"
+    return manifest
+
+
+def scene_key(module, scene, settings):
+    """Cache key for rendering ``scene`` from src/<module>.py; settings is anything JSON that changes the output."""
+    key = {
+        "scene": scene,
+        "sources": source_manifest(module),
+        "toolchain": toolchain_versions(),
+        "settings": settings,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+class RenderCache:
+    """Size-bounded artifact store with LRU eviction, shared by every render.py run."""
+
+    def __init__(self, folder=cache_folder, max_bytes=DEFAULT_MAX_BYTES):
+        self.folder = Path(folder)
+        self.objects = self.folder / "objects"
+        self.index_path = self.folder / "index.json"
+        self.lock_path = self.folder / "index.lock"
+        self.max_bytes = max_bytes
+        self.index = self.load()
+        # What this run changed, for merging with other runs' saves: entries it dropped, stats as loaded
+        self.removed = set()
+        self.loaded_stats = dict(self.stats)
+
+    def load(self):
+        if self.index_path.exists():
+            return json.loads(self.index_path.read_text())
+        return {"entries": {}, "stats": {"hits": 0, "misses": 0, "bytes_saved": 0}}
+
+    @property
+    def entries(self):
+        return self.index["entries"]
+
+    @property
+    def stats(self):
+        return self.index["stats"]
+
+    def size(self):
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def fetch(self, names):
+        """Return {name: path} if every artifact is cached, otherwise None. Counts one hit or miss."""
+        paths = {name: self.objects / name for name in names}
+        if not all(name in self.entries and path.exists() for name, path in paths.items()):
+            self.stats["misses"] += 1
+            return None
+        now = time.time()
+        for name in names:
+            self.entries[name]["last_used"] = now
+            self.stats["bytes_saved"] += self.entries[name]["size"]
+        self.stats["hits"] += 1
+        return paths
+
+    def put(self, name, artifact):
+        self.objects.mkdir(parents=True, exist_ok=True)
+        path = self.objects / name
+        shutil.copyfile(artifact, path)
+        self.entries[name] = {"size": path.stat().st_size, "last_used": time.time()}
+        self.evict()
+        return path
+
+    def evict(self):
+        """Drop least recently used artifacts until the store fits in max_bytes."""
+        total = self.size()
+        for name in sorted(self.entries, key=lambda name: self.entries[name]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self.entries.pop(name)["size"]
+            self.removed.add(name)
+            (self.objects / name).unlink(missing_ok=True)
+
+    def clear(self):
+        shutil.rmtree(self.objects, ignore_errors=True)
+        self.removed.update(self.entries)
+        self.entries.clear()
+
+    def save(self):
+        """Merge this run's changes into the index on disk, which other runs may have saved to meanwhile."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            disk = self.load()
+            entries = {name: entry for name, entry in disk["entries"].items() if name not in self.removed}
+            for name, entry in self.entries.items():
+                # Gone from disk, another run evicted or cleared it since this one loaded the index
+                if name not in disk["entries"] and not (self.objects / name).exists():
+                    continue
+                if name not in entries or entries[name]["last_used"] < entry["last_used"]:
+                    entries[name] = entry
+            stats = {name: disk["stats"].get(name, 0) + value - self.loaded_stats.get(name, 0) for name, value in self.stats.items()}
+            self.index = {"entries": entries, "stats": stats}
+            self.evict()
+            # Via a temporary file so a run loading the index never reads half of it
+            temporary = self.index_path.with_name(f".index.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps(self.index, indent=2))
+            os.replace(temporary, self.index_path)
+        self.removed.clear()
+        self.loaded_stats = dict(self.stats)
+
+
+def format_bytes(size):
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def print_stats(cache):
+    stats = cache.stats
+    lookups = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / lookups if lookups else 0
+    print(f"hits:        {stats['hits']}")
+    print(f"misses:      {stats['misses']}")
+    print(f"hit rate:    {hit_rate:.0%}")
+    print(f"bytes saved: {format_bytes(stats['bytes_saved'])}")
+    print(f"stored:      {len(cache.entries)} artifacts, {format_bytes(cache.size())} of {format_bytes(cache.max_bytes)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["stats", "clear"])
+    args = parser.parse_args(argv)
+    cache = RenderCache()
+    if args.command == "stats":
+        print_stats(cache)
+    elif args.command == "clear":
+        cache.clear()
+        cache.save()
+        print("render cache cleared")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
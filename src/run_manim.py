@@ -0,0 +1,13 @@
+"""Drop-in replacement for ``python -m manim`` that installs the hooks listed in RENDER_HOOKS first.
+
+    RENDER_HOOKS=fanout python src/run_manim.py render -r 1280,720 src/curly.py CurlyBraceTransformation
+"""
+import os
+
+from manim.__main__ import main
+
+import hooks
+
+if __name__ == "__main__":
+    hooks.install(os.environ.get("RENDER_HOOKS"))
+    main()
@@ -0,0 +1,60 @@
+"""Seeded random streams for scenes, so every render of a scene draws the same numbers.
+
+    from seeding import random_stream
+
+    rng = random_stream(self, "particles")      # a numpy Generator
+    x = rng.uniform(-7, 7)
+
+Each name is its own stream, derived from the seed, the scene's class name and
+the stream name, so drawing more numbers from one (more particles) doesn't
+change what the others draw. Asking for the same name again continues the same
+stream. With identical draws, re-renders are identical frame for frame, which
+is what lets the render and segment caches hit for scenes with noise in them.
+
+Updaters that draw every frame shouldn't carry one stream from frame to
+frame: when manim or the segment cache skips a play, its updaters run once
+for the whole play, and everything drawn after that would differ from a full
+render. They draw each step from its own stream instead, so step 120 draws the
+same numbers however the steps before it were run:
+
+    rng = step_stream(self, "noise", step)
+
+The seed is RENDER_SEED (``render.py --seed``) if set, else the scene's
+``seed`` class attribute, else 0.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+DEFAULT_SEED = 0
+
+streams = {}
+
+
+def scene_seed(scene):
+    seed = os.environ.get("RENDER_SEED")
+    if seed:
+        return int(seed)
+    return getattr(scene, "seed", DEFAULT_SEED)
+
+
+def seed_sequence(scene, name, *extra):
+    """SeedSequence mixing the seed with the names (and ``extra`` integers) into an independent stream."""
+    scene_name = type(scene).__name__ if scene is not None else ""
+    name_words = np.frombuffer(hashlib.sha256(f"{scene_name}/{name}".encode()).digest(), dtype=np.uint32)
+    return np.random.SeedSequence([scene_seed(scene), *name_words.tolist(), *extra])
+
+
+def random_stream(scene, name):
+    """The numpy Generator for stream ``name`` of ``scene`` (None for components that aren't given a scene)."""
+    scene_name = type(scene).__name__ if scene is not None else ""
+    key = (scene_seed(scene), scene_name, name)
+    if key not in streams:
+        streams[key] = np.random.default_rng(seed_sequence(scene, name))
+    return streams[key]
+
+
+def step_stream(scene, name, step):
+    """A new Generator for step ``step`` of ``name``, independent of every other step. Not cached."""
+    return np.random.default_rng(seed_sequence(scene, name, step))
@@ -0,0 +1,161 @@
+"""Persistent cache of individual play()/wait() segments.
+
+manim already names each partial movie file after a hash of the camera, the
+animations and the state of every mobject going into the play() call, but it
+only looks for them in media/videos/<module>/<quality>/partial_movie_files.
+This hook copies every partial movie (and the fanout ones) into a store outside
+media/, and restores them from there before manim decides whether to render a
+segment. Segments survive a media/ wipe and are shared between branches and runs.
+
+    RENDER_SEGMENT_CACHE=.segment-cache       store location (default)
+    RENDER_SEGMENT_CACHE_MAX_MB=4096          evict oldest segments above this size
+    RENDER_SEGMENT_CACHE_MAX_DAYS=30          evict segments unused for this long
+    RENDER_SEGMENT_STORE=local                storage backend, see STORES
+"""
+import abc
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+
+from hooks import patch
+
+repo_root = Path(__file__).resolve().parent.parent
+
+
+class SegmentStore(abc.ABC):
+    """Somewhere to keep finished segments between runs. Subclass and add to STORES for other backends."""
+
+    @abc.abstractmethod
+    def fetch(self, key, destination):
+        """Copy the segment to destination, returning False if it isn't stored."""
+
+    @abc.abstractmethod
+    def store(self, key, source):
+        """Keep the segment at source under key."""
+
+    def evict(self):
+        pass
+
+
+class LocalSegmentStore(SegmentStore):
+    """Segments as plain files in a folder, evicted by total size and age (least recently used first)."""
+
+    def __init__(self, folder, max_bytes, max_age):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key):
+        return self.folder / key[:2] / key
+
+    def fetch(self, key, destination):
+        path = self.path(key)
+        if not path.exists():
+            return False
+        copy_atomic(path, destination)
+        # mtime doubles as the last used time for eviction
+        path.touch()
+        return True
+
+    def store(self, key, source):
+        path = self.path(key)
+        if path.exists():
+            path.touch()
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        copy_atomic(source, path)
+
+    def evict(self):
+        now = time.time()
+        segments = []
+        for path in self.folder.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            stat = path.stat()
+            if now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+            else:
+                segments.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in segments)
+        for _, size, path in sorted(segments):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+STORES = {
+    "local": LocalSegmentStore,
+}
+
+
+def copy_atomic(source, destination):
+    """Copy via a temporary file so a concurrent render never sees half a segment."""
+    destination = Path(destination)
+    temporary = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    shutil.copyfile(source, temporary)
+    os.replace(temporary, destination)
+
+
+def open_store():
+    backend = os.environ.get("RENDER_SEGMENT_STORE", "local")
+    return STORES[backend](
+        os.environ.get("RENDER_SEGMENT_CACHE", repo_root / ".segment-cache"),
+        max_bytes=float(os.environ.get("RENDER_SEGMENT_CACHE_MAX_MB", 4096)) * 1024**2,
+        max_age=float(os.environ.get("RENDER_SEGMENT_CACHE_MAX_DAYS", 30)) * 86400,
+    )
+
+
+def segment_key(hash_invocation, width, height, extension, transparent, manim_version):
+    """manim's play() hash plus what it leaves out: output size, container, transparency and manim version."""
+    settings = f"{hash_invocation}|{width}x{height}|{extension}|{transparent}|{manim_version}"
+    return hashlib.sha256(settings.encode()).hexdigest() + extension
+
+
+def segment_files(file_writer, hash_invocation):
+    """(key, partial movie path) for manim's own output and every fanout output."""
+    from manim import __version__, config
+
+    extension = config.movie_file_extension
+    name = f"{hash_invocation}{extension}"
+    sizes = [(config.pixel_width, config.pixel_height, file_writer.partial_movie_directory)]
+    sizes += [(output.width, output.height, output.partial_movie_directory) for output in getattr(file_writer, "fanout_outputs", [])]
+    return [
+        (segment_key(hash_invocation, width, height, extension, config.transparent, __version__), folder / name)
+        for width, height, folder in sizes
+    ]
+
+
+def install():
+    from manim import logger
+    from manim.scene.scene_file_writer import SceneFileWriter
+    from manim.utils.file_ops import write_to_movie
+
+    store = open_store()
+
+    @patch(SceneFileWriter, "is_already_cached")
+    def is_already_cached(original, self, hash_invocation):
+        if hasattr(self, "partial_movie_directory") and write_to_movie() and not hash_invocation.startswith("uncached"):
+            missing = [(key, path) for key, path in segment_files(self, hash_invocation) if not path.exists()]
+            if missing and all(store.fetch(key, path) for key, path in missing):
+                logger.info("Segment %(hash)s restored from the segment cache", {"hash": hash_invocation})
+        return original(self, hash_invocation)
+
+    @patch(SceneFileWriter, "end_animation")
+    def end_animation(original, self, allow_write=False):
+        original(self, allow_write)
+        if not (allow_write and write_to_movie()):
+            return
+        path = Path(self.partial_movie_files[self.renderer.num_plays])
+        if path.stem.startswith("uncached"):
+            return
+        for key, segment_path in segment_files(self, path.stem):
+            store.store(key, segment_path)
+
+    @patch(SceneFileWriter, "finish")
+    def finish(original, self):
+        original(self)
+        store.evict()
@@ -0,0 +1,50 @@
+"""Split one scene's timeline into contiguous play() ranges and join the rendered pieces.
+
+Each range is rendered by its own manim process with ``-n first,last``: manim
+fast-forwards through the earlier plays without rasterizing them, so N shards
+take roughly 1/N of the wall-clock time of a long scene. The shard movies share
+codec settings, so joining them is a stream copy.
+
+A fast-forwarded play runs its updaters once, for the whole play. Updaters that
+draw random numbers every frame have to give the same result either way for a
+shard that starts mid-scene to continue the same walk: NoiseBox does, it steps
+to the play's last frame with one seeded stream per step (seeding.step_stream).
+"""
+import av
+
+
+def plan(durations, count):
+    """Split play durations into at most ``count`` contiguous (first, last) ranges of similar length."""
+    count = max(1, min(count, len(durations)))
+    total = sum(durations)
+    ranges = []
+    first = 0
+    elapsed = 0.0
+    for index, duration in enumerate(durations):
+        elapsed += duration
+        remaining_plays = len(durations) - index - 1
+        remaining_shards = count - len(ranges) - 1
+        # Cut once this shard has its share of the time, keeping a play for every shard still to come
+        if remaining_shards and (elapsed >= total * (len(ranges) + 1) / count or remaining_plays == remaining_shards):
+            ranges.append((first, index))
+            first = index + 1
+    ranges.append((first, len(durations) - 1))
+    return ranges
+
+
+def concat(movies, output_path):
+    """Join movies with identical codec settings without re-encoding, like manim's partial movie combine."""
+    list_path = output_path.with_suffix(".txt")
+    list_path.write_text("".join(f"file 'file:{movie.as_posix()}'\n" for movie in movies))
+    with av.open(str(list_path), options={"safe": "0"}, format="concat") as movies_input:
+        input_stream = movies_input.streams.video[0]
+        with av.open(str(output_path), mode="w") as output:
+            output_stream = output.add_stream(template=input_stream)
+            for packet in movies_input.demux(input_stream):
+                if packet.dts is None:
+                    continue
+                packet.dts = None
+                packet.stream = output_stream
+                output.mux(packet)
+    list_path.unlink()
+
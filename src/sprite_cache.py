@@ -0,0 +1,165 @@
+"""Composite cached sprites for animations that always look the same at the same point of their cycle.
+
+curly.py plays three identical thinking spinners, and tokenwindow.py plays the
+same one three times, rasterizing the same frames every time. An animation
+opts in by declaring that it is pure and periodic:
+
+    sprite_period = 1           rate_func(alpha) per cycle
+    def sprite_key(self):       hashable, everything except its position and alpha that decides its look
+
+The first time a frame of it is needed, its mobject is rasterized alone on a
+transparent camera and cropped to a small RGBA sprite. Frames with the same
+key, phase of the cycle, camera framing and sub-pixel position (the same
+spinner in a later play, or its next cycle) composite that sprite onto the
+play's static background instead of drawing the vectors again. The phase comes
+from the animation's rate_func(alpha), which a play's ``rate_func=`` replaces.
+
+Only plays in which everything that moves belongs to such animations use
+sprites. Any other play renders as usual, and so does the rest of a play once a
+sprite would be cut off by the edge of the frame.
+"""
+import math
+
+import numpy as np
+from manim import BLACK, logger
+from manim.camera.camera import Camera
+from manim.camera.moving_camera import MovingCamera
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from hooks import patch
+
+
+class SpriteCamera(Camera):
+    """Transparent, and the framing changes between sprites, so never reuse a cairo context."""
+
+    def get_cached_cairo_context(self, pixel_array):
+        return None
+
+    def cache_cairo_context(self, pixel_array, ctx):
+        pass
+
+
+def pixel_position(camera, point):
+    """Where ``point`` lands in the frame, in fractional pixels (x, y)."""
+    shifted = point - camera.frame_center
+    x = shifted[0] * camera.pixel_width / camera.frame_width + camera.pixel_width / 2
+    y = -shifted[1] * camera.pixel_height / camera.frame_height + camera.pixel_height / 2
+    return x, y
+
+
+def composite(pixel_array, sprite, left, top):
+    """Draw a premultiplied RGBA sprite over the frame, like cairo's OVER."""
+    height, width = pixel_array.shape[:2]
+    x0, y0 = max(left, 0), max(top, 0)
+    x1, y1 = min(left + sprite.shape[1], width), min(top + sprite.shape[0], height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    source = sprite[y0 - top:y1 - top, x0 - left:x1 - left]
+    region = pixel_array[y0:y1, x0:x1]
+    coverage = 255 - source[:, :, 3:4].astype(np.uint16)
+    region[:] = source + (region * coverage + 127) // 255
+
+
+class SpriteCache:
+    def __init__(self):
+        # (sprite key, phase, framing, sub-pixel offset) -> (pixels, offset of the corner from the mobject's pixel)
+        self.sprites = {}
+        self.camera = None
+        self.hits = 0
+        self.misses = 0
+        # The play the state below is for, and its (animation, sprite key) pairs, None to render it as usual
+        self.play = None
+        self.keys = None
+
+    def start_play(self, renderer, scene, moving_mobjects):
+        self.play = renderer.num_plays
+        self.keys = None
+        if type(renderer.camera) not in (Camera, MovingCamera) or not moving_mobjects:
+            return
+        animations = list(scene.animations or [])
+        if not animations or not all(callable(getattr(animation, "sprite_key", None)) for animation in animations):
+            return
+        animated = {id(mobject) for animation in animations for mobject in animation.mobject.get_family()}
+        if any(id(mobject) not in animated for moving in moving_mobjects for mobject in moving.get_family()):
+            return
+        # Composite in the order the camera would have drawn them
+        order = {id(mobject): index for index, mobject in enumerate(moving_mobjects)}
+        animations.sort(key=lambda animation: order.get(id(animation.mobject), len(order)))
+        self.keys = [(animation, animation.sprite_key()) for animation in animations]
+
+    def draw(self, renderer, time):
+        """Composite this frame from sprites, returning False if it has to be rasterized instead."""
+        camera = renderer.camera
+        framing = (camera.pixel_width, camera.pixel_height, round(camera.frame_width, 9), round(camera.frame_height, 9))
+        placed = []
+        for animation, key in self.keys:
+            alpha = min(time / animation.run_time, 1) if animation.run_time else 1
+            # Where the animation is in its cycle, eased the same way its interpolate_mobject eases it
+            progress = animation.rate_func(alpha)
+            phase = round(progress % animation.sprite_period / animation.sprite_period, 9)
+            x, y = pixel_position(camera, animation.mobject.get_center())
+            left, top = math.floor(x), math.floor(y)
+            sprite_key = (key, phase, framing, round(x - left, 2), round(y - top, 2))
+            sprite = self.sprites.get(sprite_key)
+            if sprite is None:
+                sprite = self.rasterize(camera, animation.mobject, left, top)
+                if sprite is None:
+                    return False
+                self.sprites[sprite_key] = sprite
+                self.misses += 1
+            else:
+                self.hits += 1
+            pixels, (dx, dy) = sprite
+            placed.append((pixels, left + dx, top + dy))
+
+        if renderer.static_image is not None:
+            camera.set_frame_to_background(renderer.static_image)
+        else:
+            camera.reset()
+        for pixels, left, top in placed:
+            composite(camera.pixel_array, pixels, left, top)
+        return True
+
+    def rasterize(self, camera, mobject, left, top):
+        """``mobject`` alone as a cropped sprite, or None if the frame edge cuts it off."""
+        if self.camera is None:
+            self.camera = SpriteCamera(
+                pixel_width=camera.pixel_width,
+                pixel_height=camera.pixel_height,
+                background_color=BLACK,
+                background_opacity=0,
+            )
+        sprite_camera = self.camera
+        sprite_camera.frame_center = np.array(camera.frame_center)
+        sprite_camera.frame_width, sprite_camera.frame_height = camera.frame_width, camera.frame_height
+        sprite_camera.reset()
+        sprite_camera.capture_mobjects([mobject])
+        alpha = sprite_camera.pixel_array[:, :, 3]
+        rows, columns = np.flatnonzero(alpha.any(axis=1)), np.flatnonzero(alpha.any(axis=0))
+        if not len(rows):
+            return np.zeros((0, 0, 4), dtype=alpha.dtype), (0, 0)
+        y0, y1, x0, x1 = rows[0], rows[-1] + 1, columns[0], columns[-1] + 1
+        if y0 == 0 or x0 == 0 or y1 == alpha.shape[0] or x1 == alpha.shape[1]:
+            return None
+        return sprite_camera.pixel_array[y0:y1, x0:x1].copy(), (x0 - left, y0 - top)
+
+
+def install():
+    cache = SpriteCache()
+
+    @patch(CairoRenderer, "render")
+    def render(original, self, scene, time, moving_mobjects):
+        if cache.play != self.num_plays:
+            cache.start_play(self, scene, moving_mobjects)
+        if cache.keys is None or not cache.draw(self, time):
+            # The rest of the play renders as usual, frames other hooks hold back stay in order
+            cache.keys = None
+            original(self, scene, time, moving_mobjects)
+            return
+        self.add_frame(self.get_frame())
+
+    @patch(CairoRenderer, "scene_finished")
+    def scene_finished(original, self, scene):
+        original(self, scene)
+        if cache.hits or cache.misses:
+            logger.info("Sprite cache: %(hits)d frames reused, %(misses)d rasterized", {"hits": cache.hits, "misses": cache.misses})
@@ -0,0 +1,333 @@
+"""Rasterize what doesn't move in a play once, and only draw what moves in each frame.
+
+manim already draws a play's static mobjects once into a background, but only
+the ones beneath everything that moves: every mobject added after the first
+moving one is drawn again in every frame. The NoiseBox particles in
+manim-communication.py are added early and move for the whole scene, so the
+signal, the labels and the icons above them were rasterized for every frame.
+
+This splits what the camera draws, in its drawing order, into runs of static
+and moving mobjects. A mobject moves if it belongs to one of the play's
+animations, it or something in it has an updater, or it is a foreground
+mobject. Each static run is rasterized once per play: the bottom one over the
+background, the ones above onto a transparent layer cropped to what was drawn.
+Each frame starts from the bottom layer, draws the moving runs with cairo and
+paints the static layers over them with cairo's OVER, in order.
+
+Frames after the first are drawn incrementally: the frame buffer is reused,
+and only the mobjects that changed since the previous frame (points, colors,
+stroke) mark their old and new pixel bounding boxes dirty. The union of those
+rectangles is reset from the bottom layer and everything overlapping it is
+redrawn, clipped to it. The loading bar draining in programmer-loading.py or one
+score block fading in media-decision.py only redraws a strip of the frame, and
+a frame where nothing changed isn't drawn at all. Dirty regions bigger than
+FULL_REDRAW of the frame, point clouds and images (which the camera writes
+without cairo, so they can't be clipped) redraw the whole frame.
+
+Plays with neither something static above something moving nor changes a dirty
+region can track, plays with scene updaters, which can change anything, and
+plays that move the camera render as usual.
+"""
+import cairo
+import numpy as np
+from manim import BLACK, VMobject, logger
+from manim.camera.camera import Camera
+from manim.camera.moving_camera import MovingCamera
+from manim.camera.multi_camera import MultiCamera
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.iterables import list_update
+
+from hooks import patch
+
+# Redraw the whole frame when the dirty region is more than this fraction of it
+FULL_REDRAW = 0.5
+# cairo's default miter limit lets a sharp corner reach 5 stroke widths past its point
+MITER_REACH = 5
+
+
+class LayerCamera(Camera):
+    """Transparent, and the framing follows the scene's camera, so never reuse a cairo context."""
+
+    def get_cached_cairo_context(self, pixel_array):
+        return None
+
+    def cache_cairo_context(self, pixel_array, ctx):
+        pass
+
+
+def supported(camera):
+    if type(camera) not in (Camera, MovingCamera, MultiCamera):
+        return False
+    # An active ZoomedScene zoom draws the zoomed camera's view in capture_mobjects
+    return not getattr(camera, "image_mobjects_from_cameras", None)
+
+
+def framing(camera):
+    return (tuple(np.round(camera.frame_center, 9)), round(camera.frame_width, 9), round(camera.frame_height, 9))
+
+
+def snapshot(mobject):
+    """Everything about a VMobject the camera's drawing depends on, the arrays as they are right now."""
+    return (
+        mobject.points,
+        mobject.fill_rgbas,
+        mobject.stroke_rgbas,
+        mobject.background_stroke_rgbas,
+        mobject.stroke_width,
+        mobject.background_stroke_width,
+        mobject.sheen_factor,
+        tuple(mobject.sheen_direction),
+        mobject.joint_type,
+        mobject.cap_style,
+    )
+
+
+def unchanged(old, new):
+    return all(np.array_equal(a, b) for a, b in zip(old, new))
+
+
+def pixel_box(camera, mobject):
+    """(left, top, right, bottom) pixels that drawing ``mobject`` can touch."""
+    x_scale = camera.pixel_width / camera.frame_width
+    y_scale = camera.pixel_height / camera.frame_height
+    width = max(mobject.get_stroke_width(), mobject.get_stroke_width(background=True))
+    # Plus a pixel of antialiasing on each side
+    pad = MITER_REACH * width * camera.cairo_line_width_multiple * x_scale + 2
+    x = (mobject.points[:, 0] - camera.frame_center[0]) * x_scale + camera.pixel_width / 2
+    y = (camera.frame_center[1] - mobject.points[:, 1]) * y_scale + camera.pixel_height / 2
+    return (x.min() - pad, y.min() - pad, x.max() + pad, y.max() + pad)
+
+
+def overlaps(box, region):
+    return box[0] < region[2] and region[0] < box[2] and box[1] < region[3] and region[1] < box[3]
+
+
+class StaticLayers:
+    def __init__(self):
+        self.camera = None
+        self.layered = 0
+        self.rasterized = 0
+        self.partial = 0
+        self.unchanged = 0
+        # The play the state below is for, the ids of everything that moves in it (None to render it as usual),
+        # the camera framing the layers were drawn at, and the layers by the ids of their mobjects
+        self.play = None
+        self.moving = None
+        self.framing = None
+        self.layers = {}
+        # What the last frame drew: its runs' ids, and each moving mobject's (pixel box, snapshot) by id,
+        # None when the frame buffer can't be drawn over incrementally
+        self.structure = None
+        self.drawn = None
+
+    def start_play(self, renderer, scene):
+        self.play = renderer.num_plays
+        self.moving = None
+        self.layers.clear()
+        self.structure = self.drawn = None
+        camera = renderer.camera
+        if not supported(camera) or scene.updaters:
+            return
+        animated = [animation.mobject for animation in scene.animations or []]
+        if any(mobject is getattr(camera, "frame", None) for mobject in animated):
+            return
+        animated = {id(mobject) for mobject in animated for mobject in mobject.get_family()}
+        foreground = {id(mobject) for mobject in scene.foreground_mobjects}
+        moving = set()
+        for mobject in list_update(scene.mobjects, scene.foreground_mobjects):
+            family = mobject.get_family()
+            if id(mobject) in foreground or any(id(member) in animated or member.updaters for member in family):
+                moving.update(id(member) for member in family)
+        self.moving = moving
+        runs = self.runs(camera, scene)
+        # Only worth it with something static above something moving, or changes dirty regions can track
+        static_above = any(static for static, _ in runs[1:])
+        trackable = all(isinstance(mobject, VMobject) for static, mobjects in runs if not static for mobject in mobjects)
+        if not runs or not (static_above or trackable):
+            self.moving = None
+            return
+        self.framing = framing(camera)
+
+    def runs(self, camera, scene):
+        """The mobjects the camera draws, in order, as [static?, mobjects] runs."""
+        runs = []
+        for mobject in camera.get_mobjects_to_display(list_update(scene.mobjects, scene.foreground_mobjects)):
+            static = id(mobject) not in self.moving
+            if runs and runs[-1][0] == static:
+                runs[-1][1].append(mobject)
+            else:
+                runs.append([static, [mobject]])
+        return runs
+
+    def draw(self, renderer, scene):
+        """Draw this frame from the layers, returning False if it has to be drawn as usual instead."""
+        camera = renderer.camera
+        if framing(camera) != self.framing:
+            return False
+        runs = self.runs(camera, scene)
+        self.layered += 1
+        boxes = self.changes(camera, runs)
+        if boxes is not None:
+            if not boxes:
+                # The frame buffer still holds this frame
+                self.unchanged += 1
+                return True
+            region = self.region(camera, boxes)
+            if region is not None:
+                self.redraw(camera, runs, region)
+                self.partial += 1
+                return True
+        for index, (static, mobjects) in enumerate(runs):
+            if static:
+                layer = self.layer(camera, mobjects, bottom=index == 0)
+                if index == 0:
+                    camera.set_frame_to_background(layer)
+                else:
+                    self.paint(camera, *layer)
+            else:
+                if index == 0:
+                    camera.reset()
+                camera.capture_mobjects(mobjects, include_submobjects=False)
+        return True
+
+    def changes(self, camera, runs):
+        """Pixel boxes of what changed since the last frame, or None if the whole frame has to be drawn."""
+        structure = [(static, [id(mobject) for mobject in mobjects]) for static, mobjects in runs]
+        moving = [mobject for static, mobjects in runs if not static for mobject in mobjects]
+        if not all(isinstance(mobject, VMobject) for mobject in moving):
+            self.structure = self.drawn = None
+            return None
+        previous, self.drawn = self.drawn, {}
+        boxes = []
+        for mobject in moving:
+            old = previous.get(id(mobject)) if previous is not None else None
+            current = snapshot(mobject)
+            if old is not None and unchanged(old[1], current):
+                self.drawn[id(mobject)] = old
+                continue
+            box = pixel_box(camera, mobject)
+            # Copied, animations (ThinkingAnimation) change some of these arrays in place
+            self.drawn[id(mobject)] = (box, tuple(np.array(value) if isinstance(value, np.ndarray) else value for value in current))
+            boxes.append(box)
+            if old is not None:
+                boxes.append(old[0])
+        # Something added, removed or reordered, nothing to compare against
+        if previous is None or structure != self.structure:
+            self.structure = structure
+            return None
+        return boxes
+
+    def region(self, camera, boxes):
+        """The pixel rectangle covering ``boxes``, or None if it's cheaper to draw the whole frame."""
+        left, top = max(0, int(min(box[0] for box in boxes))), max(0, int(min(box[1] for box in boxes)))
+        right = min(camera.pixel_width, int(np.ceil(max(box[2] for box in boxes))))
+        bottom = min(camera.pixel_height, int(np.ceil(max(box[3] for box in boxes))))
+        if right <= left or bottom <= top:
+            # Changed entirely off screen
+            return (0, 0, 0, 0)
+        if (right - left) * (bottom - top) > FULL_REDRAW * camera.pixel_width * camera.pixel_height:
+            return None
+        return (left, top, right, bottom)
+
+    def redraw(self, camera, runs, region):
+        """Draw the frame over the last one, only inside ``region``."""
+        left, top, right, bottom = region
+        if right <= left:
+            return
+        # The bottom layer was drawn by the first frame of the play, with the same runs
+        background = self.layer(camera, runs[0][1], bottom=True) if runs[0][0] else camera.background
+        camera.pixel_array[top:bottom, left:right] = background[top:bottom, left:right]
+        ctx = camera.get_cairo_context(camera.pixel_array)
+        matrix = ctx.get_matrix()
+        ctx.identity_matrix()
+        ctx.rectangle(left, top, right - left, bottom - top)
+        ctx.clip()
+        ctx.set_matrix(matrix)
+        # MovingCamera makes a new context for every draw, have it use the clipped one
+        camera.get_cached_cairo_context = lambda pixel_array: ctx
+        try:
+            for index, (static, mobjects) in enumerate(runs):
+                if static:
+                    if index:
+                        self.paint(camera, *self.layer(camera, mobjects, bottom=False))
+                    continue
+                inside = [mobject for mobject in mobjects if overlaps(self.drawn[id(mobject)][0], region)]
+                if inside:
+                    camera.capture_mobjects(inside, include_submobjects=False)
+        finally:
+            del camera.get_cached_cairo_context
+            ctx.reset_clip()
+
+    def layer(self, camera, mobjects, bottom):
+        key = (bottom, tuple(id(mobject) for mobject in mobjects))
+        if key not in self.layers:
+            self.layers[key] = self.rasterize(camera, mobjects) if not bottom else self.rasterize_bottom(camera, mobjects)
+            self.rasterized += 1
+        return self.layers[key]
+
+    def rasterize_bottom(self, camera, mobjects):
+        camera.reset()
+        camera.capture_mobjects(mobjects, include_submobjects=False)
+        return np.array(camera.pixel_array)
+
+    def rasterize(self, camera, mobjects):
+        """``mobjects`` on a transparent layer, cropped, as (pixels, cairo surface, left, top)."""
+        if self.camera is None:
+            self.camera = LayerCamera(
+                pixel_width=camera.pixel_width,
+                pixel_height=camera.pixel_height,
+                background_color=BLACK,
+                background_opacity=0,
+            )
+        layer_camera = self.camera
+        layer_camera.frame_center = np.array(camera.frame_center)
+        layer_camera.frame_width, layer_camera.frame_height = camera.frame_width, camera.frame_height
+        layer_camera.reset()
+        layer_camera.capture_mobjects(mobjects, include_submobjects=False)
+        alpha = layer_camera.pixel_array[:, :, 3]
+        rows, columns = np.flatnonzero(alpha.any(axis=1)), np.flatnonzero(alpha.any(axis=0))
+        if not len(rows):
+            return None, None, 0, 0
+        y0, y1, x0, x1 = rows[0], rows[-1] + 1, columns[0], columns[-1] + 1
+        # Same premultiplied ARGB32 bytes cairo drew, a contiguous copy so the rows have cairo's stride
+        pixels = layer_camera.pixel_array[y0:y1, x0:x1].copy()
+        surface = cairo.ImageSurface.create_for_data(pixels, cairo.FORMAT_ARGB32, int(x1 - x0), int(y1 - y0))
+        return pixels, surface, int(x0), int(y0)
+
+    def paint(self, camera, pixels, surface, left, top):
+        if surface is None:
+            return
+        ctx = camera.get_cairo_context(camera.pixel_array)
+        ctx.save()
+        # The context maps frame units to pixels, the layer is placed in pixels
+        ctx.identity_matrix()
+        ctx.set_source_surface(surface, left, top)
+        ctx.paint()
+        ctx.restore()
+
+
+def install():
+    layers = StaticLayers()
+
+    @patch(CairoRenderer, "update_frame")
+    def update_frame(original, self, scene=None, mobjects=None, include_submobjects=True, ignore_skipping=True, **kwargs):
+        # Frames of a play come with the scene's moving_mobjects, the static background and last frame don't
+        frame = scene is not None and mobjects is getattr(scene, "moving_mobjects", None) and include_submobjects and not kwargs
+        if frame and not (self.skip_animations and not ignore_skipping):
+            if layers.play != self.num_plays:
+                layers.start_play(self, scene)
+            if layers.moving is not None and layers.draw(self, scene):
+                return
+            # The rest of the play is drawn as usual
+            layers.moving = None
+        original(self, scene, mobjects, include_submobjects, ignore_skipping, **kwargs)
+
+    @patch(CairoRenderer, "scene_finished")
+    def scene_finished(original, self, scene):
+        original(self, scene)
+        if layers.layered:
+            logger.info(
+                "Static layers: %(layered)d frames drawn over %(rasterized)d cached layers, "
+                "%(partial)d of them only in their dirty region and %(unchanged)d not at all",
+                {"layered": layers.layered, "rasterized": layers.rasterized, "partial": layers.partial, "unchanged": layers.unchanged},
+            )
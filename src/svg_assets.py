@@ -0,0 +1,129 @@
+"""SVG assets parsed once per process, with their geometry cached on disk across runs.
+
+    from manim import *
+    from svg_assets import SVGMobject
+
+Drop-in for manim's SVGMobject. manim already keeps parsed SVGs in memory, but
+only per file name, and every new process parses every icon again with
+svgelements. Here the curves and fill/stroke colors an SVG turns into are
+keyed on the file's content (plus the parsing options and manim version), so
+``../video_assets/neural2.svg`` and ``./video_assets/neural2.svg`` are the same
+asset, and the first process to parse a file saves its point arrays to a
+compressed .npz that every later run loads instead. Each SVGMobject gets its
+own copy of the curves; sizing, coloring and positioning work as usual.
+
+    RENDER_SVG_CACHE=.svg-cache        location (default)
+"""
+import atexit
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+import manim
+from manim import VMobject, logger
+
+repo_root = Path(__file__).resolve().parent.parent
+
+
+class SVGAssets:
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        # key -> list of VMobjects, unscaled and unstyled by the SVGMobject arguments
+        self.parsed = {}
+        self.hits = 0
+        self.loads = 0
+        self.misses = 0
+
+    def key(self, svg):
+        content = hashlib.sha256(svg.get_file_path().read_bytes()).hexdigest()
+        settings = repr((content, sorted(svg.svg_default.items()), sorted(svg.path_string_config.items()), manim.__version__))
+        return hashlib.sha256(settings.encode()).hexdigest()
+
+    def path(self, key):
+        return self.folder / f"{key}.npz"
+
+    def get(self, svg, parse):
+        """Copies of the submobjects ``svg`` parses into, calling ``parse()`` only if no process has before."""
+        key = self.key(svg)
+        shapes = self.parsed.get(key)
+        if shapes is not None:
+            self.hits += 1
+        else:
+            shapes = self.load(key)
+            if shapes is not None:
+                self.loads += 1
+            else:
+                self.misses += 1
+                shapes = parse()
+                try:
+                    self.save(key, shapes)
+                except OSError as error:
+                    logger.warning(f"Couldn't cache {svg.file_name}: {error}")
+                else:
+                    # Reloaded so the in-memory copy is plain curves too, without svgelements' path objects
+                    shapes = self.load(key) or shapes
+            self.parsed[key] = shapes
+        return [shape.copy() for shape in shapes]
+
+    def load(self, key):
+        try:
+            with np.load(self.path(key)) as arrays:
+                arrays = dict(arrays)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+        shapes = []
+        points = np.split(arrays["points"], np.cumsum(arrays["point_counts"])[:-1])
+        fills = np.split(arrays["fill_rgbas"], np.cumsum(arrays["fill_counts"])[:-1])
+        strokes = np.split(arrays["stroke_rgbas"], np.cumsum(arrays["stroke_counts"])[:-1])
+        for shape_points, fill_rgbas, stroke_rgbas, stroke_width in zip(points, fills, strokes, arrays["stroke_widths"]):
+            shape = VMobject()
+            shape.points = shape_points
+            shape.fill_rgbas = fill_rgbas
+            shape.stroke_rgbas = stroke_rgbas
+            shape.stroke_width = float(stroke_width)
+            shapes.append(shape)
+        return shapes
+
+    def save(self, key, shapes):
+        arrays = {
+            "points": np.concatenate([shape.points for shape in shapes]) if shapes else np.zeros((0, 3)),
+            "point_counts": np.array([len(shape.points) for shape in shapes], dtype=np.int64),
+            "fill_rgbas": np.concatenate([shape.fill_rgbas for shape in shapes]) if shapes else np.zeros((0, 4)),
+            "fill_counts": np.array([len(shape.fill_rgbas) for shape in shapes], dtype=np.int64),
+            "stroke_rgbas": np.concatenate([shape.stroke_rgbas for shape in shapes]) if shapes else np.zeros((0, 4)),
+            "stroke_counts": np.array([len(shape.stroke_rgbas) for shape in shapes], dtype=np.int64),
+            "stroke_widths": np.array([shape.stroke_width for shape in shapes], dtype=np.float64),
+        }
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Via a temporary file so a concurrent render never reads half an entry
+        temporary = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(temporary, **arrays)
+        os.replace(temporary, path)
+
+
+assets = SVGAssets(os.environ.get("RENDER_SVG_CACHE", repo_root / ".svg-cache"))
+
+
+class SVGMobject(manim.SVGMobject):
+    def generate_mobject(self):
+        def parse():
+            # manim's parse adds the shapes to self and flips them, hand them back as they end up
+            super(SVGMobject, self).generate_mobject()
+            shapes = list(self.submobjects)
+            self.remove(*shapes)
+            return shapes
+
+        self.add(*assets.get(self, parse))
+
+
+@atexit.register
+def log_stats():
+    if assets.hits or assets.loads or assets.misses:
+        logger.info(
+            "SVG assets: %(hits)d reused, %(loads)d loaded from disk, %(misses)d parsed",
+            {"hits": assets.hits, "loads": assets.loads, "misses": assets.misses},
+        )
@@ -0,0 +1,67 @@
+"""Memoized Tex/MathTex for scenes that build the same labels over and over.
+
+    from manim import *
+    from tex_cache import MathTex, Tex
+
+Drop-in for manim's Tex and MathTex. The first call with a given string,
+template, environment, font size, color and other arguments builds the
+mobject, and later calls get a copy of it instead of going through LaTeX file
+lookup and SVG parsing again. Copies are independent, so scaling or coloring
+one doesn't touch the others.
+"""
+import atexit
+from collections import OrderedDict
+
+import manim
+from manim import logger
+from manim.utils.tex import TexTemplate
+
+
+class TexCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_part(value):
+        # Templates are compared by their LaTeX, everything else by repr (colors, dicts, ...)
+        if isinstance(value, TexTemplate):
+            return value.body
+        return repr(value)
+
+    def get(self, cls, *tex_strings, **kwargs):
+        key = (cls.__name__, tex_strings, tuple(sorted((name, self.key_part(value)) for name, value in kwargs.items())))
+        mobject = self.entries.get(key)
+        if mobject is None:
+            self.misses += 1
+            mobject = cls(*tex_strings, **kwargs)
+            self.entries[key] = mobject
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return mobject.copy()
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+cache = TexCache()
+
+
+def Tex(*tex_strings, **kwargs):
+    return cache.get(manim.Tex, *tex_strings, **kwargs)
+
+
+def MathTex(*tex_strings, **kwargs):
+    return cache.get(manim.MathTex, *tex_strings, **kwargs)
+
+
+@atexit.register
+def log_stats():
+    if cache.hits or cache.misses:
+        logger.info("Tex cache: %(hits)d hits, %(misses)d misses", {"hits": cache.hits, "misses": cache.misses})
@@ -0,0 +1,169 @@
+"""Compile every Tex/MathTex the scenes use into manim's Tex cache, in parallel, before rendering.
+
+manim compiles each new Tex string with latex + dvisvgm the moment the scene
+creates it, one at a time, so on a clean media/Tex a scene mostly waits on
+LaTeX. This runs every scene once with animations skipped (``--dry_run -n``)
+and the collect hook below installed. The hook writes each .tex file manim
+would compile, but hands the scene a placeholder SVG instead of compiling it.
+The collected files are then compiled on a process pool with manim's own
+compile_tex/convert_to_svg, so the real render finds them all cached.
+
+Strings built at runtime (``Tex(idea_names[i])``) are found as long as
+construct() gets that far with placeholder glyphs. Anything missed is compiled
+by the render as usual.
+
+    uv run python src/tex_precompile.py               every scene in render.py
+    uv run python src/tex_precompile.py --only curly tokenwindow -w 8
+"""
+import argparse
+import atexit
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+src_folder = repo_root / "src"
+media_folder = repo_root / "media"
+
+# A single square glyph, enough for construct() to keep going
+PLACEHOLDER_SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><path d="M0 0H10V10H0Z"/></svg>\n'
+
+
+def install():
+    """Collect hook: record the Tex files a scene needs instead of compiling them."""
+    from manim import config
+    from manim.mobject.text import tex_mobject
+    from manim.utils.tex_file_writing import generate_tex_file
+
+    from hooks import patch
+
+    collect_path = os.environ["RENDER_TEX_COLLECT"]
+    placeholder = Path(tempfile.mkdtemp(prefix="tex-placeholder-")) / "placeholder.svg"
+    placeholder.write_text(PLACEHOLDER_SVG)
+    records = {}
+
+    @patch(tex_mobject, "tex_to_svg_file")
+    def tex_to_svg_file(original, expression, environment=None, tex_template=None):
+        if tex_template is None:
+            tex_template = config["tex_template"]
+        tex_file = generate_tex_file(expression, environment, tex_template)
+        if tex_file.with_suffix(".svg").exists():
+            return tex_file.with_suffix(".svg")
+        records[str(tex_file)] = {
+            "tex_file": str(tex_file),
+            "expression": expression,
+            "tex_compiler": tex_template.tex_compiler,
+            "output_format": tex_template.output_format,
+        }
+        return placeholder
+
+    # Written at exit, so a construct() that trips over a placeholder still reports what it got to
+    @atexit.register
+    def write_records():
+        with open(collect_path, "w") as collect_file:
+            json.dump(list(records.values()), collect_file)
+
+
+def collect(scenes, workers):
+    """Dry run each (module, scene) with the collect hook, returning the Tex files still to compile."""
+
+    def collect_scene(module, scene):
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as collect_file:
+            collect_path = Path(collect_file.name)
+        command = [
+            sys.executable, str(src_folder / "run_manim.py"), "render",
+            "--dry_run", "-n", "1000000",
+            "--progress_bar", "none",
+            str(src_folder / f"{module}.py"),
+            scene,
+        ]
+        env = dict(os.environ, RENDERING_MODE="True", RENDER_HOOKS="tex_precompile", RENDER_TEX_COLLECT=str(collect_path))
+        subprocess.run(command, cwd=repo_root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        records = json.loads(collect_path.read_text()) if collect_path.stat().st_size else []
+        collect_path.unlink()
+        return records
+
+    records = {}
+    # Threads are enough, each dry run is its own manim process
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for scene_records in pool.map(lambda scene: collect_scene(*scene), scenes):
+            for record in scene_records:
+                records[record["tex_file"]] = record
+    return list(records.values())
+
+
+def init_worker(media_dir):
+    from manim import config
+
+    config.media_dir = str(media_dir)
+
+
+def compile_one(record):
+    """Compile one .tex file to svg, returning (seconds, error or None)."""
+    from manim.utils.tex_file_writing import compile_tex, convert_to_svg
+
+    start = time.perf_counter()
+    try:
+        dvi_file = compile_tex(Path(record["tex_file"]), record["tex_compiler"], record["output_format"])
+        convert_to_svg(dvi_file, record["output_format"])
+    except Exception as error:
+        return time.perf_counter() - start, str(error)
+    return time.perf_counter() - start, None
+
+
+def delete_nonsvg_files(tex_dir):
+    """manim's LaTeX cleanup, once at the end instead of after every string."""
+    for path in tex_dir.iterdir():
+        if path.suffix not in (".svg", ".tex"):
+            path.unlink(missing_ok=True)
+
+
+def precompile(scenes, workers=None, media_dir=media_folder):
+    """Collect and compile the Tex strings of ``scenes``; returns the number that failed."""
+    workers = workers or os.cpu_count()
+    start = time.perf_counter()
+    records = collect(scenes, workers)
+    if not records:
+        print(f"LaTeX: nothing to precompile ({time.perf_counter() - start:.1f}s to check)")
+        return 0
+
+    timings = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(media_dir,)) as pool:
+        for record, (seconds, error) in zip(records, pool.map(compile_one, records)):
+            timings.append((seconds, record["expression"], error))
+    delete_nonsvg_files(Path(records[0]["tex_file"]).parent)
+
+    failed = 0
+    for seconds, expression, error in sorted(timings, key=lambda timing: timing[0], reverse=True):
+        print(f"  {seconds:6.2f}s  {' '.join(expression.split())[:70]}")
+        if error:
+            failed += 1
+            print(f"           failed: {error.splitlines()[0]}")
+    print(
+        f"LaTeX: compiled {len(records) - failed}/{len(records)} strings in {time.perf_counter() - start:.1f}s "
+        f"({sum(timing[0] for timing in timings):.1f}s of compile time)"
+    )
+    return failed
+
+
+def main(argv=None):
+    from render import SCENES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of latex processes to run at once")
+    parser.add_argument("--only", nargs="+", help="only these modules or scene names")
+    args = parser.parse_args(argv)
+    scenes = [
+        (module, scene) for module, scene, _ in SCENES
+        if not args.only or module in args.only or scene in args.only
+    ]
+    return 1 if precompile(scenes, args.workers) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Persistent cache of finished Text and MarkupText mobjects.
+
+manim keeps the SVG Pango writes for a piece of text in media/texts/, but still
+parses it into bezier curves, splits it into characters and restyles it every
+time. This hook pickles the finished mobject, keyed on the class, every
+argument (text or markup, font, size, weight, slant, line spacing, color, ...)
+and the manim and Pango versions. A warm cache skips Pango and SVG parsing
+entirely. The cache lives outside media/ and is shared by every process and run:
+
+    RENDER_TEXT_CACHE=.text-cache        location (default)
+    RENDER_TEXT_CACHE_MAX_MB=512         evict least recently used entries above this size
+"""
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parent.parent
+
+
+class TextCache:
+    def __init__(self, folder, max_bytes):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key):
+        return self.folder / key[:2] / f"{key}.pickle"
+
+    def load(self, key):
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            mobject = pickle.loads(data)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return None
+        # mtime doubles as the last used time for eviction
+        path.touch()
+        self.hits += 1
+        return mobject
+
+    def save(self, key, mobject):
+        try:
+            data = pickle.dumps(mobject, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Via a temporary file so a concurrent render never reads half an entry
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+    def evict(self):
+        entries = []
+        for path in self.folder.glob("*/*.pickle"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def toolchain():
+    import manimpango
+    from manim import __version__
+
+    pango_version = getattr(manimpango, "pango_version", lambda: "")()
+    return f"manim {__version__} manimpango {manimpango.__version__} pango {pango_version}"
+
+
+def text_key(cls, args, kwargs, versions):
+    settings = repr((cls.__module__, cls.__qualname__, args, sorted(kwargs.items()), versions))
+    return hashlib.sha256(settings.encode()).hexdigest()
+
+
+def install():
+    from manim import MarkupText, Text, logger
+    from manim.renderer.cairo_renderer import CairoRenderer
+
+    from hooks import patch
+
+    cache = TextCache(
+        os.environ.get("RENDER_TEXT_CACHE", repo_root / ".text-cache"),
+        max_bytes=float(os.environ.get("RENDER_TEXT_CACHE_MAX_MB", 512)) * 1024**2,
+    )
+    versions = toolchain()
+
+    def cached_init(cls):
+        @patch(cls, "__init__")
+        def __init__(original, self, *args, **kwargs):
+            key = text_key(type(self), args, kwargs, versions)
+            cached = cache.load(key)
+            if cached is not None:
+                self.__dict__.update(cached.__dict__)
+                return
+            original(self, *args, **kwargs)
+            cache.save(key, self)
+
+    cached_init(Text)
+    cached_init(MarkupText)
+
+    @patch(CairoRenderer, "scene_finished")
+    def scene_finished(original, self, scene):
+        original(self, scene)
+        if cache.hits or cache.misses:
+            logger.info("Text cache: %(hits)d hits, %(misses)d misses", {"hits": cache.hits, "misses": cache.misses})
+        cache.evict()
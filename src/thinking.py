@@ -0,0 +1,81 @@
+"""The "thinking" spinner shared by curly.py, curly-mcp.py and tokenwindow.py.
+
+    from thinking import ThinkingAnimation
+
+    self.play(ThinkingAnimation(radius=.4, num_dots=10, color=GREY_E, position=[-5.2, 1.8, 0]))
+
+A ring of dots whose opacities follow a sine wave around the ring. Each dot's
+phase offset is computed once, and at the start of every play the dots' color
+arrays are made views into one shared array, so a frame sets the opacity of
+every dot with a single NumPy write instead of a set_opacity call per dot.
+
+Its look only depends on rate_func(alpha), one cycle per play, so it declares
+itself pure and periodic for sprite_cache.py, which rasterizes each frame of the
+cycle once.
+"""
+import numpy as np
+
+from manim import BLACK, ORIGIN, RIGHT, TAU, Animation, Dot, VGroup, linear
+
+
+class ThinkingAnimation(Animation):
+    # One full turn of the wave per play
+    sprite_period = 1
+
+    def __init__(
+        self,
+        position=ORIGIN,
+        radius=3,
+        num_dots=8,
+        color=BLACK,
+        rate_func=linear,
+        run_time=2,
+        **kwargs
+    ):
+        self.num_dots = num_dots
+        self.radius = radius
+        # Where each dot is in the wave when the animation starts
+        self.phases = np.arange(num_dots) * TAU / num_dots
+
+        # Dots arranged in a circle, moved as a whole to position
+        self.circle_group = VGroup(*[
+            Dot(point=radius * RIGHT, color=color, radius=0.15).rotate(phase, about_point=ORIGIN)
+            for phase in self.phases
+        ])
+        self.circle_group.move_to(position)
+
+        super().__init__(
+            self.circle_group,
+            rate_func=rate_func,
+            run_time=run_time,
+            **kwargs
+        )
+
+    def sprite_key(self):
+        """The dots' shapes and colors, the spinner looks the same wherever it is at the same alpha."""
+        dots = list(self.circle_group)
+        shapes = np.concatenate([dot.points for dot in dots]) - self.circle_group.get_center()
+        colors = np.concatenate([np.concatenate([dot.fill_rgbas[:, :3], dot.stroke_rgbas[:, :3]]) for dot in dots])
+        return (type(self).__name__, shapes.round(6).tobytes(), colors.round(6).tobytes(), tuple(dot.stroke_width for dot in dots))
+
+    def begin(self):
+        # Again on every play, animations in between (FadeOut, ...) replace the dots' arrays
+        self.fill_rgbas, self.fill_rows = self.share_rgbas("fill_rgbas")
+        self.stroke_rgbas, self.stroke_rows = self.share_rgbas("stroke_rgbas")
+        super().begin()
+
+    def share_rgbas(self, name):
+        """One array with every dot's ``name`` rows, and which dot each row belongs to. The dots get views into it."""
+        dots = list(self.circle_group)
+        counts = [len(getattr(dot, name)) for dot in dots]
+        shared = np.concatenate([getattr(dot, name) for dot in dots])
+        starts = np.cumsum([0, *counts])
+        for dot, start, end in zip(dots, starts, starts[1:]):
+            setattr(dot, name, shared[start:end])
+        return shared, np.repeat(np.arange(len(dots)), counts)
+
+    def interpolate_mobject(self, alpha):
+        # Overriding this skips the rate_func manim applies per submobject, so apply it here
+        opacities = (np.sin(self.rate_func(alpha) * TAU + self.phases) + 1) / 2
+        self.fill_rgbas[:, 3] = opacities[self.fill_rows]
+        self.stroke_rgbas[:, 3] = opacities[self.stroke_rows]
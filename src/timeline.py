@@ -0,0 +1,28 @@
+"""Record the duration of every play()/wait() call to RENDER_TIMELINE as JSON.
+
+Meant for a run that skips every animation (``-n 1000000 --dry_run``), so the
+scene is fast-forwarded without rasterizing anything. shards.py uses the result
+to split a scene into time ranges.
+"""
+import json
+import os
+
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from hooks import patch
+
+
+def install():
+    timeline_path = os.environ["RENDER_TIMELINE"]
+    durations = []
+
+    @patch(CairoRenderer, "play")
+    def play(original, self, scene, *args, **kwargs):
+        original(self, scene, *args, **kwargs)
+        durations.append(scene.duration)
+
+    @patch(CairoRenderer, "scene_finished")
+    def scene_finished(original, self, scene):
+        original(self, scene)
+        with open(timeline_path, "w") as timeline_file:
+            json.dump({"scene": type(scene).__name__, "durations": durations}, timeline_file)
@@ -1,4 +1,7 @@
 from manim import *
+from tex_cache import Tex
+from svg_assets import SVGMobject
+from thinking import ThinkingAnimation
 import numpy as np
 
 import os
@@ -21,48 +24,6 @@ if not os.path.exists(os.path.join(asset_folder, "neural2.svg")):
 if os.environ.get("RENDERING_MODE"):
     asset_folder = "./video_assets" # Redundant, already defined above - but keeping for consistency with your original code
 
-class ThinkingAnimation(Animation):
-    def __init__(
-        self,
-        position=ORIGIN,  # Added position parameter
-        radius=3,
-        num_dots=8,
-        color=BLACK,
-        rate_func=linear,
-        run_time=2,
-        **kwargs
-    ):
-        # Create a VGroup to hold all the dots
-        self.circle_group = VGroup()
-        self.num_dots = num_dots
-        self.radius = radius
-
-        # Create dots arranged in a circle
-        for i in range(num_dots):
-            angle = i * TAU / num_dots
-            dot = Dot(
-                point=radius * RIGHT,
-                color=color,
-                radius=0.15
-            ).rotate(angle, about_point=ORIGIN)
-            self.circle_group.add(dot)
-
-        # Move the entire group to the specified position
-        self.circle_group.move_to(position)
-
-        super().__init__(
-            self.circle_group,
-            rate_func=rate_func,
-            run_time=run_time,
-            **kwargs
-        )
-
-    def interpolate_mobject(self, alpha):
-        for i, dot in enumerate(self.circle_group):
-            phase = alpha * TAU + (i * TAU / self.num_dots)
-            opacity = (np.sin(phase) + 1) / 2
-            dot.set_opacity(opacity)
-
 class ContextWindowAnimation(Scene):
     def construct(self):
         # Set the background color to white - Ensuring white background
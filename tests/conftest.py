@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The modules under test are flat scripts in src/, imported the way the scenes import them
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import LEFT, RIGHT, Camera, Dot, MovingCamera, Square  # noqa: E402
+
+from culling import Culling  # noqa: E402
+
+
+class Play:
+    """Just what Culling.start_play reads from a scene."""
+
+    def __init__(self, mobjects, animated=()):
+        self.mobjects = mobjects
+        self.foreground_mobjects = []
+        self.updaters = []
+        self.animations = [type("Animation", (), {"mobject": mobject})() for mobject in animated]
+
+
+def test_keeps_only_what_overlaps_the_frame():
+    camera = Camera()
+    inside, outside = Square().move_to(LEFT), Square().move_to(100 * RIGHT)
+    assert Culling().visible(camera, [inside, outside]) == [inside]
+
+
+def test_strokes_reaching_into_the_frame_are_kept():
+    camera = Camera()
+    edge = camera.frame_width / 2
+    # Points just past the right edge, the stroke still reaches over it
+    thick = Square(side_length=0.1).set_stroke(width=200).move_to((edge + 0.1) * RIGHT)
+    thin = Square(side_length=0.1).set_stroke(width=1).move_to((edge + 0.5) * RIGHT)
+    assert Culling().visible(camera, [thick, thin]) == [thick]
+
+
+def test_follows_a_zooming_camera():
+    camera = MovingCamera()
+    dot = Dot(2 * RIGHT)
+    culling = Culling()
+    assert culling.visible(camera, [dot]) == [dot]
+    camera.frame.scale(0.1)
+    assert culling.visible(camera, [dot]) == []
+
+
+def test_static_bounds_are_only_reused_within_a_play():
+    camera = Camera()
+    square = Square()
+    culling = Culling()
+    culling.start_play(Play([square]))
+    assert culling.visible(camera, [square]) == [square]
+    culling.end_play()
+    # Moved by the scene between plays
+    square.move_to(100 * RIGHT)
+    culling.start_play(Play([square]))
+    assert culling.visible(camera, [square]) == []
+
+
+def test_animated_mobjects_are_measured_every_frame():
+    camera = Camera()
+    square = Square()
+    culling = Culling()
+    culling.start_play(Play([square], animated=[square]))
+    assert culling.visible(camera, [square]) == [square]
+    square.move_to(100 * RIGHT)
+    assert culling.visible(camera, [square]) == []
+    assert culling.culled == 1 and culling.considered == 2
@@ -0,0 +1,61 @@
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from manim import ZoomedScene  # noqa: E402
+
+import lazy_zoom  # noqa: E402
+
+
+def install(monkeypatch):
+    """Installs the hook until the test ends, returning the warnings it logs."""
+    for name in ("setup", "tear_down", "create_zoomed_camera", "zoomed_display"):
+        monkeypatch.setattr(ZoomedScene, name, getattr(ZoomedScene, name, None), raising=False)
+    logged = []
+    monkeypatch.setattr(lazy_zoom.logger, "warning", lambda message, args: logged.append(message % args))
+    lazy_zoom.install()
+    return logged
+
+
+class Unzoomed(ZoomedScene):
+    CONFIG = {"zoom_factor": 0.3}
+
+    def construct(self):
+        self.zoomed_camera.frame.scale(0.8)
+        self.add(manim.Square())
+        self.wait(0.2)
+
+
+class Zoomed(ZoomedScene):
+    def construct(self):
+        self.add(manim.Square())
+        self.zoomed_camera.frame.move_to(manim.RIGHT)
+        self.activate_zooming()
+        self.wait(0.2)
+
+
+def render(scene_class, media_dir):
+    settings = {"media_dir": str(media_dir), "pixel_width": 160, "pixel_height": 90, "frame_rate": 5, "write_to_movie": False}
+    with manim.tempconfig(settings):
+        scene = scene_class()
+        scene.render()
+        return scene, scene.renderer.get_frame()
+
+
+def test_unused_zoom_makes_no_camera_and_warns(monkeypatch, tmp_path):
+    warnings = install(monkeypatch)
+    scene, _ = render(Unzoomed, tmp_path)
+    assert isinstance(scene.zoomed_camera, lazy_zoom.LazyZoomedCamera)
+    assert scene._zoomed_display is None
+    assert any("never activates zooming" in warning for warning in warnings)
+    assert any("CONFIG" in warning for warning in warnings)
+
+
+def test_activated_zoom_renders_like_manims(monkeypatch, tmp_path):
+    # manim's own first, then with the hook
+    _, expected = render(Zoomed, tmp_path / "manim")
+    warnings = install(monkeypatch)
+    scene, frame = render(Zoomed, tmp_path / "lazy")
+    assert isinstance(scene.zoomed_camera, manim.MovingCamera)
+    assert not warnings
+    assert (frame == expected).all()
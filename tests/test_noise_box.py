@@ -0,0 +1,59 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+av = pytest.importorskip("av")
+
+SOURCE = Path(__file__).resolve().parent.parent / "src" / "manim-communication.py"
+
+
+def load_communication():
+    spec = importlib.util.spec_from_file_location("manim_communication", SOURCE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def render(media_dir, last_wait, caching):
+    """Render a NoiseBox for a few waits, the last partial movie's frames and the final particle positions."""
+    settings = {
+        "media_dir": str(media_dir),
+        "pixel_width": 160,
+        "pixel_height": 90,
+        "frame_rate": 10,
+        "disable_caching": not caching,
+        "verbosity": "WARNING",
+    }
+    with manim.tempconfig(settings):
+        communication = load_communication()
+
+        class NoiseScene(manim.Scene):
+            def construct(self):
+                noise_box = communication.NoiseBox(num_particles=20, scene=self, name="noise")
+                self.add(noise_box)
+                noise_box.start_animation()
+                self.wait(1)
+                self.wait(1)
+                self.wait(last_wait)
+                self.noise_points = noise_box.particles.points.copy()
+
+        scene = NoiseScene()
+        scene.render()
+        with av.open(scene.renderer.file_writer.partial_movie_files[-1]) as movie:
+            frames = [frame.to_ndarray(format="rgb24") for frame in movie.decode(video=0)]
+        return frames, scene.noise_points
+
+
+def test_cached_plays_leave_the_walk_where_a_full_render_does(tmp_path):
+    render(tmp_path / "cached", last_wait=0.5, caching=True)
+    # Same first two waits, manim skips them and takes them from the cache
+    cached_frames, cached_points = render(tmp_path / "cached", last_wait=0.6, caching=True)
+    full_frames, full_points = render(tmp_path / "full", last_wait=0.6, caching=False)
+
+    np.testing.assert_allclose(cached_points, full_points)
+    assert len(cached_frames) == len(full_frames)
+    for cached, full in zip(cached_frames, full_frames):
+        np.testing.assert_array_equal(cached, full)
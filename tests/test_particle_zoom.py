@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import BLACK, MovingCamera  # noqa: E402
+from manim.camera.camera import Camera  # noqa: E402
+
+import particle_zoom  # noqa: E402
+from particles import ParticleCloud  # noqa: E402
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    # Put the unpatched method back after the test
+    monkeypatch.setattr(Camera, "display_multiple_point_cloud_mobjects", Camera.display_multiple_point_cloud_mobjects)
+    particle_zoom.install()
+
+
+def drawn_width(camera, cloud):
+    """Width in pixels of what ``camera`` draws for a one particle ``cloud``."""
+    camera.reset()
+    camera.capture_mobjects([cloud])
+    columns = np.nonzero(camera.pixel_array[..., :3].any(axis=(0, 2)))[0]
+    return columns.max() - columns.min() + 1
+
+
+def zoomed_widths():
+    camera = MovingCamera(background_color=BLACK)
+    cloud = ParticleCloud([[0, 0, 0]], radius=0.05)
+    width = drawn_width(camera, cloud)
+    camera.frame.scale(0.1)
+    return width, drawn_width(camera, cloud), cloud.pixel_width(camera)
+
+
+def test_particles_keep_their_pixel_size_without_the_hook():
+    width, zoomed, _ = zoomed_widths()
+    assert zoomed == width
+
+
+def test_particles_grow_when_the_camera_zooms_in(installed):
+    width, zoomed, expected = zoomed_widths()
+    assert zoomed == expected >= 9 * width
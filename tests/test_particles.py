@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from particles import MoveParticles, ParticleField, brute_force_repulsion, neighbour_pairs, repulsion  # noqa: E402
+
+DISTANCE = 0.5
+STRENGTH = 4.0
+FPS = 60
+
+
+def closest_pair(points):
+    offsets = points[:, None, :2] - points[None, :, :2]
+    lengths = np.sqrt((offsets**2).sum(axis=2))
+    np.fill_diagonal(lengths, np.inf)
+    return lengths.min()
+
+
+def run(field, seconds, push):
+    """Play the field frame by frame like MoveParticles, with the repulsion updater after each frame."""
+    for frame in range(round(seconds * FPS)):
+        field.set_time(frame / FPS)
+        if push:
+            field.push(repulsion(field.points, DISTANCE, STRENGTH) / FPS)
+    field.set_time(seconds)
+    return field.points
+
+
+def clustered_field():
+    rng = np.random.default_rng(0)
+    starts = np.zeros((8, 3))
+    starts[:, :2] = rng.uniform(-0.1, 0.1, (8, 2))
+    # Everyone drifts the same way, only the repulsion can separate them
+    return ParticleField(starts, starts + [1, 0, 0], run_times=3)
+
+
+def test_pushes_accumulate_across_set_time():
+    field = clustered_field()
+    field.push(np.full_like(field.points, 0.25))
+    field.set_time(1.5)
+    assert np.allclose(field.points, field.starts + [0.5, 0, 0] + 0.25)
+
+
+def test_repulsion_separates_pairs_to_the_repulsion_distance():
+    assert closest_pair(run(clustered_field(), 3, push=False)) < DISTANCE / 2
+    # The push falls off to nothing at DISTANCE, so pairs settle right at it
+    assert closest_pair(run(clustered_field(), 3, push=True)) > 0.95 * DISTANCE
+
+
+
+@pytest.mark.parametrize("count, distance", [(0, 0.2), (1, 0.2), (200, 0.2), (500, 0.05), (300, 1.5)])
+def test_grid_repulsion_matches_all_pairs(count, distance):
+    points = np.zeros((count, 3))
+    points[:, :2] = np.random.default_rng(count).uniform(-2, 2, (count, 2))
+    assert np.allclose(repulsion(points, distance, 2.0), brute_force_repulsion(points, distance, 2.0))
+
+
+def test_each_close_pair_is_found_once():
+    points = np.array([[0, 0, 0], [0.1, 0, 0], [0.1, 0.1, 0], [5, 5, 0]], dtype=float)
+    i, j = neighbour_pairs(points, 0.2)
+    assert sorted(tuple(sorted(pair)) for pair in zip(i.tolist(), j.tolist())) == [(0, 1), (0, 2), (1, 2)]
+
+
+def test_each_particle_keeps_its_own_delay_and_run_time():
+    starts = np.zeros((3, 3))
+    field = ParticleField(starts, starts + [2, 0, 0], delays=[0, 1, 0], run_times=[1, 1, 4])
+    assert field.duration == 4
+    assert MoveParticles(field).run_time == 4
+    field.set_time(1)
+    assert np.allclose(field.points[:, 0], [2, 0, 0.5])
+    field.set_time(10)
+    assert np.allclose(field.points[:, 0], 2)
+
+
+def test_opacities_are_blended_with_the_background():
+    starts = np.zeros((2, 3))
+    field = ParticleField(starts, starts, opacities=[1, 0.25], color="#FF0000", background="#FFFFFF")
+    assert np.allclose(field.rgbas, [[1, 0, 0, 1], [1, 0.75, 0.75, 1]])
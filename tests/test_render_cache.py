@@ -0,0 +1,116 @@
+import os
+
+import pytest
+
+import render
+import render_cache
+from render_cache import RenderCache, scene_key, source_manifest
+
+
+@pytest.fixture
+def src(tmp_path, monkeypatch):
+    """A src/ folder with a scene that imports a helper and references an asset."""
+    folder = tmp_path / "src"
+    folder.mkdir()
+    (folder / "scene.py").write_text('import helper\nlogo = "logo.svg"\n')
+    (folder / "helper.py").write_text("import numpy\nSIZE = 1\n")
+    (tmp_path / "logo.svg").write_text("<svg/>")
+    monkeypatch.setattr(render_cache, "src_folder", folder)
+    monkeypatch.setattr(render_cache, "ASSET_FOLDERS", [tmp_path])
+    monkeypatch.setattr(render_cache, "toolchain_versions", lambda: {"manim": "0.19.0"})
+    return folder
+
+
+def test_manifest_follows_local_imports_and_assets(src):
+    assert sorted(source_manifest("scene")) == ["asset/logo.svg", "src/helper.py", "src/scene.py"]
+
+
+@pytest.mark.parametrize("path, content", [
+    ("src/helper.py", "SIZE = 2\n"),
+    ("logo.svg", "<svg></svg>"),
+])
+def test_key_changes_with_what_the_scene_depends_on(src, path, content):
+    before = scene_key("scene", "Scene", {"profile": "gif"})
+    (src.parent / path).write_text(content)
+    assert scene_key("scene", "Scene", {"profile": "gif"}) != before
+
+
+def test_key_changes_with_scene_and_settings(src):
+    key = scene_key("scene", "Scene", {"profile": "gif"})
+    assert scene_key("scene", "Scene", {"profile": "gif"}) == key
+    assert scene_key("scene", "Other", {"profile": "gif"}) != key
+    assert scene_key("scene", "Scene", {"profile": "720p"}) != key
+
+
+def test_job_key_covers_the_enabled_hooks(monkeypatch):
+    monkeypatch.delenv("RENDER_HOOKS", raising=False)
+    job = render.Job("curly", "CurlyBraceTransformation", ("gif",))
+    with_culling = render.Job("curly", "CurlyBraceTransformation", ("gif",), hooks=("culling",))
+    assert render.job_key(job) == render.job_key(render.Job("curly", "CurlyBraceTransformation", ("gif",)))
+    assert render.job_key(with_culling) != render.job_key(job)
+
+
+def test_scene_hooks_are_part_of_the_job():
+    jobs = render.build_jobs(["gif"], ["filter"], hooks=("culling",))
+    assert [job.hooks for job in jobs] == [("particle_zoom", "culling")]
+
+
+def artifact(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_fetch_counts_hits_and_misses(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    assert cache.fetch(["a.gif"]) is None
+    cache.put("a.gif", artifact(tmp_path, "a", 10))
+    assert cache.fetch(["a.gif"]) == {"a.gif": cache.objects / "a.gif"}
+    # Every artifact of a job has to be there
+    assert cache.fetch(["a.gif", "a.mp4"]) is None
+    assert cache.stats == {"hits": 1, "misses": 2, "bytes_saved": 10}
+
+
+def test_evicts_least_recently_used_first(tmp_path):
+    cache = RenderCache(tmp_path / "cache", max_bytes=25)
+    cache.put("a", artifact(tmp_path, "a", 10))
+    cache.put("b", artifact(tmp_path, "b", 10))
+    cache.entries["a"]["last_used"] = cache.entries["b"]["last_used"] + 1
+    cache.put("c", artifact(tmp_path, "c", 10))
+    assert sorted(cache.entries) == ["a", "c"]
+    assert not (cache.objects / "b").exists()
+
+
+def test_concurrent_saves_merge(tmp_path):
+    folder = tmp_path / "cache"
+    first, second = RenderCache(folder), RenderCache(folder)
+    first.put("a", artifact(tmp_path, "a", 10))
+    first.fetch(["a"])
+    second.put("b", artifact(tmp_path, "b", 10))
+    second.fetch(["missing"])
+    first.save()
+    second.save()
+
+    merged = RenderCache(folder)
+    assert sorted(merged.entries) == ["a", "b"]
+    assert merged.stats == {"hits": 1, "misses": 1, "bytes_saved": 10}
+
+
+def test_saved_removals_stick(tmp_path):
+    folder = tmp_path / "cache"
+    cache = RenderCache(folder)
+    cache.put("a", artifact(tmp_path, "a", 10))
+    cache.save()
+    # Another run that still has "a" loaded saves after the clear
+    other = RenderCache(folder)
+    cache.clear()
+    cache.save()
+    other.save()
+    assert RenderCache(folder).entries == {}
+
+
+def test_saved_index_leaves_no_temporary_files(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    cache.put("a", artifact(tmp_path, "a", 10))
+    cache.save()
+    assert sorted(os.listdir(cache.folder)) == ["index.json", "index.lock", "objects"]
@@ -0,0 +1,95 @@
+import os
+import time
+
+import pytest
+
+import segment_cache
+from segment_cache import LocalSegmentStore, SegmentStore, segment_key
+
+KEY_ARGS = ("1234_5678_9abc", 320, 200, ".mp4", False, "0.19.0")
+
+
+def test_key_is_stable_and_keeps_the_extension():
+    assert segment_key(*KEY_ARGS) == segment_key(*KEY_ARGS)
+    assert segment_key(*KEY_ARGS).endswith(".mp4")
+
+
+@pytest.mark.parametrize("index, value", [
+    (0, "1234_5678_ffff"),  # manim's hash of the play
+    (1, 1280),              # output size, manim's hash doesn't include it
+    (2, 720),
+    (3, ".mov"),
+    (4, True),
+    (5, "0.18.1"),
+])
+def test_key_changes_with_everything_the_segment_depends_on(index, value):
+    changed = list(KEY_ARGS)
+    changed[index] = value
+    assert segment_key(*changed) != segment_key(*KEY_ARGS)
+
+
+def test_store_needs_fetch_and_store():
+    class Partial(SegmentStore):
+        def fetch(self, key, destination):
+            return False
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def store(tmp_path, max_bytes=1024**2, max_age=86400):
+    return LocalSegmentStore(tmp_path / "store", max_bytes, max_age)
+
+
+def segment(tmp_path, name, size=10):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_round_trip(tmp_path):
+    segments = store(tmp_path)
+    destination = tmp_path / "restored.mp4"
+    assert not segments.fetch("ab.mp4", destination)
+    segments.store("ab.mp4", segment(tmp_path, "a.mp4"))
+    assert segments.fetch("ab.mp4", destination)
+    assert destination.read_bytes() == b"x" * 10
+    # No temporary files left behind on either side
+    assert [path.name for path in tmp_path.glob(".*")] == []
+    assert [path.name for path in segments.folder.glob("*/.*")] == []
+
+
+def age(segments, key, seconds):
+    path = segments.path(key)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_evicts_least_recently_used_above_the_size_limit(tmp_path):
+    segments = store(tmp_path, max_bytes=25)
+    for key in ("aa", "bb", "cc"):
+        segments.store(key, segment(tmp_path, key))
+    age(segments, "aa", 30)
+    age(segments, "bb", 20)
+    # Using a segment makes it recent again
+    segments.fetch("aa", tmp_path / "restored")
+    segments.evict()
+    assert sorted(path.name for path in segments.folder.glob("*/*")) == ["aa", "cc"]
+
+
+def test_evicts_segments_unused_for_too_long(tmp_path):
+    segments = store(tmp_path, max_age=60)
+    segments.store("aa", segment(tmp_path, "aa"))
+    segments.store("bb", segment(tmp_path, "bb"))
+    age(segments, "aa", 120)
+    segments.evict()
+    assert [path.name for path in segments.folder.glob("*/*")] == ["bb"]
+
+
+def test_store_comes_from_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("RENDER_SEGMENT_CACHE", str(tmp_path / "segments"))
+    monkeypatch.setenv("RENDER_SEGMENT_CACHE_MAX_MB", "1")
+    monkeypatch.setenv("RENDER_SEGMENT_CACHE_MAX_DAYS", "2")
+    segments = segment_cache.open_store()
+    assert isinstance(segments, LocalSegmentStore)
+    assert (segments.folder, segments.max_bytes, segments.max_age) == (tmp_path / "segments", 1024**2, 2 * 86400)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+av = pytest.importorskip("av")
+
+from shards import concat, plan  # noqa: E402
+
+
+def covers_every_play(ranges, count):
+    """Contiguous, in order, starting at the first play and ending at the last."""
+    starts = [first for first, _ in ranges]
+    ends = [last for _, last in ranges]
+    return starts[0] == 0 and ends[-1] == count - 1 and all(end + 1 == start for end, start in zip(ends, starts[1:]))
+
+
+def test_even_plays_split_evenly():
+    assert plan([1] * 8, 4) == [(0, 1), (2, 3), (4, 5), (6, 7)]
+
+
+def test_splits_by_time_not_play_count():
+    # The first play is half the scene
+    assert plan([4, 1, 1, 1, 1], 2) == [(0, 0), (1, 4)]
+
+
+def test_never_more_shards_than_plays():
+    assert plan([1, 2], 8) == [(0, 0), (1, 1)]
+    assert plan([5], 3) == [(0, 0)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 7])
+def test_every_play_rendered_once(count):
+    durations = np.random.default_rng(count).uniform(0.1, 5, 20).tolist()
+    ranges = plan(durations, count)
+    assert len(ranges) == count
+    assert covers_every_play(ranges, len(durations))
+    assert all(first <= last for first, last in ranges)
+
+
+def write_movie(path, frames, shade):
+    with av.open(str(path), mode="w") as container:
+        stream = container.add_stream("libx264", rate=10)
+        stream.width, stream.height, stream.pix_fmt = 32, 32, "yuv420p"
+        for _ in range(frames):
+            image = np.full((32, 32, 3), shade, dtype=np.uint8)
+            container.mux(stream.encode(av.VideoFrame.from_ndarray(image, format="rgb24")))
+        container.mux(stream.encode())
+    return path
+
+
+def test_concat_joins_every_frame_in_order(tmp_path):
+    movies = [write_movie(tmp_path / "a.mp4", 3, 0), write_movie(tmp_path / "b.mp4", 4, 255)]
+    output = tmp_path / "joined.mp4"
+    concat(movies, output)
+    with av.open(str(output)) as joined:
+        shades = [frame.to_ndarray(format="rgb24").mean() for frame in joined.decode(video=0)]
+    assert len(shades) == 7
+    assert max(shades[:3]) < 20 and min(shades[3:]) > 235
+    assert not output.with_suffix(".txt").exists()
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from manim import WHITE, Scene, smooth  # noqa: E402
+from manim.renderer.cairo_renderer import CairoRenderer  # noqa: E402
+
+import sprite_cache  # noqa: E402
+from thinking import ThinkingAnimation  # noqa: E402
+
+
+class Spinners(Scene):
+    def construct(self):
+        self.play(ThinkingAnimation(radius=0.8, num_dots=6, color=WHITE, run_time=1))
+        # Same spinner, eased by the play: the same alphas now land on other points of the cycle
+        self.play(ThinkingAnimation(radius=0.8, num_dots=6, color=WHITE, run_time=1), rate_func=smooth)
+
+
+def render(monkeypatch, media_dir):
+    frames = []
+    monkeypatch.setattr(CairoRenderer, "add_frame", lambda self, frame, num_frames=1: frames.append(frame.copy()))
+    settings = {"media_dir": str(media_dir), "pixel_width": 160, "pixel_height": 90, "frame_rate": 10, "write_to_movie": False}
+    with manim.tempconfig(settings):
+        Spinners().render()
+    return frames
+
+
+def test_eased_plays_render_the_same_frames_from_sprites(monkeypatch, tmp_path):
+    expected = render(monkeypatch, tmp_path / "plain")
+    for name in ("render", "scene_finished"):
+        monkeypatch.setattr(CairoRenderer, name, getattr(CairoRenderer, name))
+    sprite_cache.install()
+    frames = render(monkeypatch, tmp_path / "sprites")
+
+    assert len(frames) == len(expected)
+    for frame, plain in zip(frames, expected):
+        # Compositing a premultiplied sprite rounds a little differently from cairo drawing in place
+        assert np.abs(frame.astype(int) - plain.astype(int)).max() <= 1
+
+
+def test_composite_blends_premultiplied_and_clips_at_the_edges():
+    frame = np.full((4, 4, 4), 200, dtype=np.uint8)
+    # Half transparent white, premultiplied, hanging off the top left corner
+    sprite = np.full((3, 3, 4), 128, dtype=np.uint8)
+    sprite_cache.composite(frame, sprite, -1, -1)
+    assert (frame[:2, :2] == 128 + (200 * 127 + 127) // 255).all()
+    assert (frame[2:, :] == 200).all() and (frame[:, 2:] == 200).all()
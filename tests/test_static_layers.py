@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+from manim import BLUE, DOWN, LEFT, RED, RIGHT, UP, WHITE, Dot, Rectangle, Scene, Square  # noqa: E402
+from manim.renderer.cairo_renderer import CairoRenderer  # noqa: E402
+
+import static_layers  # noqa: E402
+
+
+class Layered(Scene):
+    def construct(self):
+        self.add(Square(side_length=6, fill_color=BLUE, fill_opacity=1))
+        dot = Dot(2 * LEFT, radius=0.3, color=RED)
+        bar = Rectangle(width=4, height=0.3, fill_color=WHITE, fill_opacity=1).shift(2 * DOWN)
+        self.add(dot, bar)
+        # Drawn above both, half transparent over the dot's path
+        self.add(Rectangle(width=1.5, height=3, fill_color=WHITE, fill_opacity=0.5, stroke_width=8).shift(0.5 * UP))
+        self.play(dot.animate.shift(4 * RIGHT), run_time=1)
+        # Only the bar's strip of the frame changes
+        self.play(bar.animate.stretch(0.25, 0, about_edge=LEFT), run_time=1)
+
+
+def render(monkeypatch, media_dir):
+    frames = []
+    monkeypatch.setattr(CairoRenderer, "add_frame", lambda self, frame, num_frames=1: frames.append(frame.copy()))
+    settings = {"media_dir": str(media_dir), "pixel_width": 160, "pixel_height": 90, "frame_rate": 10, "write_to_movie": False}
+    with manim.tempconfig(settings):
+        Layered().render()
+    return frames
+
+
+def test_layered_and_dirty_region_frames_match_a_plain_render(monkeypatch, tmp_path):
+    expected = render(monkeypatch, tmp_path / "plain")
+
+    created = []
+
+    class Recorded(static_layers.StaticLayers):
+        def __init__(self):
+            super().__init__()
+            created.append(self)
+
+    for name in ("update_frame", "scene_finished"):
+        monkeypatch.setattr(CairoRenderer, name, getattr(CairoRenderer, name))
+    monkeypatch.setattr(static_layers, "StaticLayers", Recorded)
+    static_layers.install()
+    frames = render(monkeypatch, tmp_path / "layers")
+
+    layers = created[0]
+    assert layers.layered and layers.partial
+    assert len(frames) == len(expected)
+    for frame, plain in zip(frames, expected):
+        # Painting a premultiplied layer rounds a little differently from cairo drawing in place
+        assert np.abs(frame.astype(int) - plain.astype(int)).max() <= 1
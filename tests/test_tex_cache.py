@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from manim.utils.tex import TexTemplate  # noqa: E402
+
+from tex_cache import TexCache  # noqa: E402
+
+
+class Built:
+    """Stands in for Tex, counting how often it is built instead of running LaTeX."""
+
+    count = 0
+
+    def __init__(self, *tex_strings, **kwargs):
+        Built.count += 1
+        self.tex_strings, self.kwargs = tex_strings, kwargs
+
+    def copy(self):
+        return Built.__new__(Built)
+
+
+@pytest.fixture(autouse=True)
+def reset_count():
+    Built.count = 0
+
+
+def test_same_arguments_build_once_and_hand_out_copies():
+    cache = TexCache()
+    first = cache.get(Built, "x^2", font_size=30, color="#FFFFFF")
+    second = cache.get(Built, "x^2", color="#FFFFFF", font_size=30)
+    assert Built.count == 1 and first is not second
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("kwargs", [{"font_size": 31}, {"color": "#000000"}, {"tex_environment": "align*"}])
+def test_any_other_argument_builds_again(kwargs):
+    cache = TexCache()
+    cache.get(Built, "x^2", font_size=30, color="#FFFFFF")
+    cache.get(Built, "x^2", **{"font_size": 30, "color": "#FFFFFF", **kwargs})
+    assert Built.count == 2
+
+
+def test_templates_compare_by_their_latex():
+    cache = TexCache()
+    cache.get(Built, "x", tex_template=TexTemplate())
+    cache.get(Built, "x", tex_template=TexTemplate())
+    template = TexTemplate()
+    template.add_to_preamble(r"\usepackage{mathrsfs}")
+    cache.get(Built, "x", tex_template=template)
+    assert Built.count == 2
+
+
+def test_least_recently_used_entry_goes_first():
+    cache = TexCache(max_entries=2)
+    cache.get(Built, "a")
+    cache.get(Built, "b")
+    cache.get(Built, "a")
+    cache.get(Built, "c")
+    cache.get(Built, "a")
+    assert Built.count == 3
+    cache.get(Built, "b")
+    assert Built.count == 4
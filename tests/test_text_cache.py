@@ -0,0 +1,61 @@
+import os
+import time
+
+from text_cache import TextCache, text_key
+
+VERSIONS = "manim 0.19.0 manimpango 0.6.0 pango 1.54"
+
+
+class Text:
+    pass
+
+
+class MarkupText:
+    pass
+
+
+class Label:
+    def __init__(self, text):
+        self.text = text
+
+
+def test_key_ignores_keyword_order():
+    assert text_key(Text, ("hi",), {"font": "Helvetica", "font_size": 28}, VERSIONS) == text_key(
+        Text, ("hi",), {"font_size": 28, "font": "Helvetica"}, VERSIONS
+    )
+
+
+def test_key_changes_with_class_arguments_and_toolchain():
+    key = text_key(Text, ("hi",), {"font_size": 28}, VERSIONS)
+    assert text_key(MarkupText, ("hi",), {"font_size": 28}, VERSIONS) != key
+    assert text_key(Text, ("ho",), {"font_size": 28}, VERSIONS) != key
+    assert text_key(Text, ("hi",), {"font_size": 30}, VERSIONS) != key
+    assert text_key(Text, ("hi",), {"font_size": 28}, VERSIONS.replace("1.54", "1.56")) != key
+
+
+def test_round_trip_counts_hits_and_misses(tmp_path):
+    cache = TextCache(tmp_path, max_bytes=1024**2)
+    assert cache.load("ab12") is None
+    cache.save("ab12", Label("hi"))
+    assert cache.load("ab12").text == "hi"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_unpicklable_and_broken_entries_are_misses(tmp_path):
+    cache = TextCache(tmp_path, max_bytes=1024**2)
+    cache.save("ab12", Label(lambda: None))
+    assert not cache.path("ab12").exists()
+    cache.path("cd34").parent.mkdir(parents=True)
+    cache.path("cd34").write_bytes(b"not a pickle")
+    assert cache.load("cd34") is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = TextCache(tmp_path, max_bytes=1)
+    cache.save("aa", Label("old"))
+    cache.save("bb", Label("new"))
+    then = time.time() - 60
+    os.utime(cache.path("aa"), (then, then))
+    cache.max_bytes = cache.path("bb").stat().st_size
+    cache.evict()
+    assert not cache.path("aa").exists() and cache.path("bb").exists()